@@ -109,8 +109,9 @@ async def example_2_field_projection():
                 }
             }
             
+            full_size = len(json.dumps(sample_data))
             print("\n📄 Sample data structure:")
-            print(f"  Full JSON: {len(json.dumps(sample_data))} characters")
+            print(f"  Full JSON: {full_size} characters")
             print(f"  Contains: users (with profiles), metadata, sensitive fields")
             
             # Example 2a: Include only needed fields
@@ -126,8 +127,9 @@ async def example_2_field_projection():
                 ]
             }
             
-            print(f"\n  ✓ Result: {len(json.dumps(projected_include))} characters")
-            print(f"  ✓ Savings: {100 - (len(json.dumps(projected_include)) / len(json.dumps(sample_data)) * 100):.1f}%")
+            include_size = len(json.dumps(projected_include))
+            print(f"\n  ✓ Result: {include_size} characters")
+            print(f"  ✓ Savings: {100 - (include_size / full_size * 100):.1f}%")
             print(f"\n  {json.dumps(projected_include, indent=2)}")
             
             # Example 2b: Exclude sensitive fields
@@ -254,9 +256,10 @@ async def example_4_combined():
         ]
     }
     
+    full_size = len(json.dumps(api_response))
     print("\n📦 Sample API response:")
     print(f"  3 users with activity logs")
-    print(f"  Size: {len(json.dumps(api_response))} characters")
+    print(f"  Size: {full_size} characters")
     
     print("\n🎯 Goal: Find Gmail users with 'Login successful' in logs")
     print("  Step 1: Project to get emails and logs only")
@@ -284,7 +287,8 @@ async def example_4_combined():
     print(f"\n  ✓ After projection: {len(json.dumps(projected))} chars")
     print(f"  ✓ After Gmail filter: {len(gmail_users['users'])} users")
     print(f"  ✓ After login filter: {len(successful_login_users['users'])} users")
-    print(f"  ✓ Total savings: {100 - (len(json.dumps(successful_login_users)) / len(json.dumps(api_response)) * 100):.1f}%")
+    final_size = len(json.dumps(successful_login_users))
+    print(f"  ✓ Total savings: {100 - (final_size / full_size * 100):.1f}%")
     
     print("\n  Final results:")
     print(json.dumps(successful_login_users, indent=2))
@@ -409,7 +413,7 @@ async def main():
         print(f"\n❌ Error running examples: {e}")
         print("\nMake sure:")
         print("  1. Proxy is configured with at least one server")
-        print("  2. config.yaml exists and is valid")
+        print("  2. mcp.json exists and is valid")
         print("  3. Run from examples/ directory: python comprehensive_example.py")
 
 
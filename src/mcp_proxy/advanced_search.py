@@ -14,10 +14,13 @@ processor pipeline via the ``BaseProcessor`` interface.
 
 from __future__ import annotations
 
+import heapq
 import math
 import re
+from array import array
 from collections import Counter
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from mcp.types import Content, TextContent
 
@@ -25,6 +28,8 @@ from mcp_proxy.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_WORD_RE = re.compile(r"\w+")
+
 
 # ---------------------------------------------------------------------------
 # BM25 ranking
@@ -41,10 +46,6 @@ class BM25Processor:
     def __init__(self, k1: float = 1.5, b: float = 0.75):
         self.k1 = k1
         self.b = b
-        # Cache document-frequency computations across calls when the
-        # corpus does not change.
-        self._df_cache_key: Optional[int] = None
-        self._df_cache: Dict[str, int] = {}
 
     def rank_chunks(
         self,
@@ -58,39 +59,49 @@ class BM25Processor:
         if not chunks:
             return []
 
-        query_terms = self._tokenize(query.lower())
+        query_terms = self._tokenize(query)
         doc_count = len(chunks)
         avg_len = sum(len(c) for c in chunks) / doc_count
 
-        # Compute IDF only once per unique corpus
-        corpus_key = hash((tuple(chunks), tuple(query_terms)))
-        if corpus_key != self._df_cache_key:
-            # Pre-tokenize all chunks once
-            chunk_token_sets = [set(self._tokenize(c.lower())) for c in chunks]
-            self._df_cache = {
-                term: sum(1 for ts in chunk_token_sets if term in ts)
-                for term in query_terms
-            }
-            self._df_cache_key = corpus_key
-
-        scored_chunks: List[Dict[str, Any]] = []
+        # Tokenize every chunk once, keeping only its length and the
+        # postings of the query terms; scoring then walks those postings.
+        wanted = set(query_terms)
+        doc_lens = array("i")
+        postings: Dict[str, List[Tuple[int, int]]] = {term: [] for term in wanted}
         for idx, chunk in enumerate(chunks):
-            score = self._calculate_bm25_score(
-                chunk, query_terms, self._df_cache, doc_count, avg_len
-            )
-            if score > 0:
-                scored_chunks.append(
-                    {
-                        "chunk": chunk,
-                        "score": score,
-                        "index": idx,
-                        "start": idx * chunk_size,
-                        "end": min((idx + 1) * chunk_size, len(text)),
-                    }
+            tokens = self._tokenize(chunk)
+            doc_lens.append(len(tokens))
+            for term, tf in Counter(t for t in tokens if t in wanted).items():
+                postings[term].append((idx, tf))
+
+        k1, b = self.k1, self.b
+        scores = array("d", bytes(8 * doc_count))
+        for term in query_terms:
+            term_postings = postings[term]
+            if not term_postings:
+                continue
+            df = len(term_postings)
+            idf = math.log((doc_count - df + 0.5) / (df + 0.5) + 1.0)
+            for idx, tf in term_postings:
+                scores[idx] += idf * (tf * (k1 + 1)) / (
+                    tf + k1 * (1 - b + b * doc_lens[idx] / avg_len)
                 )
 
-        scored_chunks.sort(key=lambda x: x["score"], reverse=True)
-        return scored_chunks[:top_k]
+        ranked = heapq.nlargest(
+            top_k,
+            (idx for idx in range(doc_count) if scores[idx] > 0),
+            key=scores.__getitem__,
+        )
+        return [
+            {
+                "chunk": chunks[idx],
+                "score": scores[idx],
+                "index": idx,
+                "start": idx * chunk_size,
+                "end": min((idx + 1) * chunk_size, len(text)),
+            }
+            for idx in ranked
+        ]
 
     # -- helpers -----------------------------------------------------------
 
@@ -105,33 +116,7 @@ class BM25Processor:
 
     @staticmethod
     def _tokenize(text: str) -> List[str]:
-        return re.findall(r"\w+", text.lower())
-
-    def _calculate_bm25_score(
-        self,
-        chunk: str,
-        query_terms: List[str],
-        term_doc_freq: Dict[str, int],
-        doc_count: int,
-        avg_doc_len: float,
-    ) -> float:
-        score = 0.0
-        chunk_tokens = self._tokenize(chunk)
-        chunk_len = len(chunk_tokens)
-        term_freq = Counter(chunk_tokens)
-
-        for term in query_terms:
-            tf = term_freq.get(term, 0)
-            if tf == 0:
-                continue
-            df = term_doc_freq.get(term, 0)
-            if df == 0:
-                continue
-            idf = math.log((doc_count - df + 0.5) / (df + 0.5) + 1.0)
-            score += idf * (tf * (self.k1 + 1)) / (
-                tf + self.k1 * (1 - self.b + self.b * chunk_len / avg_doc_len)
-            )
-        return score
+        return _WORD_RE.findall(text.lower())
 
 
 # ---------------------------------------------------------------------------
@@ -159,18 +144,33 @@ class FuzzyMatcher:
         # Early termination: minimum possible distance for a window
         max_allowed_distance = int((1.0 - threshold) * max(pattern_len, 1))
 
+        prefiltered = bool(pattern) and text.isascii() and pattern.isascii()
+        if prefiltered:
+            # Lowercase once; candidates already passed the pre-check
+            lowered = text.lower()
+            pattern_lower = pattern.lower()
+            candidates = FuzzyMatcher._ascii_candidates(
+                lowered, pattern_lower, max_allowed_distance
+            )
+        else:
+            candidates = range(text_len - pattern_len + 1)
+
         skip_until = -1
-        for i in range(text_len - pattern_len + 1):
+        for i in candidates:
             if i < skip_until:
                 continue
 
             window = text[i : i + pattern_len]
 
-            # Quick character-count pre-check
-            if not FuzzyMatcher._quick_similarity_check(pattern, window, max_allowed_distance):
-                continue
-
-            similarity = FuzzyMatcher._similarity(pattern, window)
+            if prefiltered:
+                similarity = FuzzyMatcher._similarity(
+                    pattern_lower, lowered[i : i + pattern_len], threshold
+                )
+            else:
+                # Quick character-count pre-check
+                if not FuzzyMatcher._quick_similarity_check(pattern, window, max_allowed_distance):
+                    continue
+                similarity = FuzzyMatcher._similarity(pattern, window, threshold)
             if similarity >= threshold:
                 context_start = max(0, i - 50)
                 context_end = min(text_len, i + pattern_len + 50)
@@ -190,6 +190,35 @@ class FuzzyMatcher:
         matches.sort(key=lambda x: x["similarity"], reverse=True)
         return matches
 
+    @staticmethod
+    def _ascii_candidates(lowered: str, pattern: str, max_distance: int) -> Iterator[int]:
+        """Yield window starts passing ``_quick_similarity_check``, in order.
+
+        Takes the already-lowercased ASCII text and pattern.  Lowercasing
+        ASCII is per character, so the character-count difference between
+        *pattern* and each window can be kept up to date in O(1) per step
+        instead of building two ``Counter`` objects per window.
+        """
+        width = len(pattern)
+        if len(lowered) < width:
+            return
+        need = Counter(pattern)
+        have: Counter[str] = Counter(lowered[:width])
+        diff = sum((need - have).values()) + sum((have - need).values())
+        limit = max_distance * 2
+        if diff <= limit:
+            yield 0
+        for i in range(1, len(lowered) - width + 1):
+            out, into = lowered[i - 1], lowered[i + width - 1]
+            if out != into:
+                # Moving one count changes |need - have| by exactly one
+                diff += 1 if have[out] <= need[out] else -1
+                have[out] -= 1
+                diff += 1 if have[into] >= need[into] else -1
+                have[into] += 1
+            if diff <= limit:
+                yield i
+
     @staticmethod
     def _quick_similarity_check(s1: str, s2: str, max_distance: int) -> bool:
         """Cheap character-frequency pre-filter."""
@@ -199,17 +228,35 @@ class FuzzyMatcher:
         return diff <= max_distance * 2
 
     @staticmethod
-    def _similarity(s1: str, s2: str) -> float:
+    def _similarity(s1: str, s2: str, threshold: Optional[float] = None) -> float:
+        """Return ``1 - distance / max_len``.
+
+        With *threshold*, results below it may be any value under the
+        threshold: the distance computation stops once it cannot reach it.
+        """
         if not s1 or not s2:
             return 0.0
-        distance = FuzzyMatcher._levenshtein_distance(s1.lower(), s2.lower())
         max_len = max(len(s1), len(s2))
+        max_distance = None
+        if threshold is not None:
+            # One edit of slack so float rounding never rejects a real match
+            max_distance = int((1.0 - threshold) * max_len) + 1
+        distance = FuzzyMatcher._levenshtein_distance(
+            s1.lower(), s2.lower(), max_distance
+        )
         return 1.0 - (distance / max_len)
 
     @staticmethod
-    def _levenshtein_distance(s1: str, s2: str) -> int:
+    def _levenshtein_distance(
+        s1: str, s2: str, max_distance: Optional[int] = None
+    ) -> int:
+        """Edit distance of *s1* and *s2*.
+
+        With *max_distance*, returns ``max_distance + 1`` as soon as every
+        entry of a DP row exceeds it (the final distance can only be larger).
+        """
         if len(s1) < len(s2):
-            return FuzzyMatcher._levenshtein_distance(s2, s1)
+            return FuzzyMatcher._levenshtein_distance(s2, s1, max_distance)
         if len(s2) == 0:
             return len(s1)
         previous_row = list(range(len(s2) + 1))
@@ -220,6 +267,8 @@ class FuzzyMatcher:
                 deletions = current_row[j] + 1
                 substitutions = previous_row[j] + (c1 != c2)
                 current_row.append(min(insertions, deletions, substitutions))
+            if max_distance is not None and min(current_row) > max_distance:
+                return max_distance + 1
             previous_row = current_row
         return previous_row[-1]
 
@@ -255,14 +304,18 @@ class ContextExtractor:
         else:
             contexts = [(line, i) for i, line in enumerate(text.split("\n"))]
 
+        finditer = regex.finditer
         for context_text, context_id in contexts:
-            if regex.search(context_text):
+            # One pass both detects and counts hits, without building the
+            # list of matched strings ``findall`` would
+            hits = sum(1 for _ in finditer(context_text))
+            if hits:
                 matches.append(
                     {
                         "context": context_text,
                         "context_id": context_id,
                         "context_type": context_type,
-                        "matches": len(regex.findall(context_text)),
+                        "matches": hits,
                     }
                 )
                 if len(matches) >= max_matches:
@@ -336,24 +389,42 @@ class StructureNavigator:
         if isinstance(data, dict):
             return {
                 "fields": len(data),
-                "total_items": sum(StructureNavigator._count_items(v) for v in data.values()),
+                "total_items": StructureNavigator._count_all(data.values()),
             }
         elif isinstance(data, list):
             return {
                 "items": len(data),
-                "total_items": sum(StructureNavigator._count_items(item) for item in data),
+                "total_items": StructureNavigator._count_all(data),
             }
         elif isinstance(data, str):
-            return {"characters": len(data), "lines": len(data.split("\n"))}
+            return {"characters": len(data), "lines": data.count("\n") + 1}
         return {}
 
     @staticmethod
     def _count_items(data: Any) -> int:
-        if isinstance(data, dict):
-            return 1 + sum(StructureNavigator._count_items(v) for v in data.values())
-        elif isinstance(data, list):
-            return len(data)
-        return 1
+        return StructureNavigator._count_all((data,))
+
+    @staticmethod
+    def _count_all(nodes: Iterable[Any]) -> int:
+        """Sum ``_count_items`` over *nodes* with an explicit stack.
+
+        Dicts count themselves plus their values (recursively), lists count
+        their length and anything else counts one.  Iterating avoids a
+        Python frame per nested dict and the recursion limit on deep input.
+        """
+        total = 0
+        stack = list(nodes)
+        pop, extend = stack.pop, stack.extend
+        while stack:
+            node = pop()
+            if isinstance(node, dict):
+                total += 1
+                extend(node.values())
+            elif isinstance(node, list):
+                total += len(node)
+            else:
+                total += 1
+        return total
 
     @staticmethod
     def _get_keys(data: Any, max_depth: int) -> Any:
@@ -362,7 +433,7 @@ class StructureNavigator:
         if isinstance(data, dict):
             return {
                 k: StructureNavigator._get_keys(data[k], max_depth - 1)
-                for k in list(data.keys())[:10]
+                for k in islice(data, 10)
             }
         elif isinstance(data, list) and data:
             return [StructureNavigator._get_keys(data[0], max_depth - 1)]
@@ -371,8 +442,10 @@ class StructureNavigator:
     @staticmethod
     def _get_sample(data: Any, max_items: int = 3) -> Any:
         if isinstance(data, dict):
-            sample_keys = list(data.keys())[:max_items]
-            return {k: StructureNavigator._get_sample(data[k], 1) for k in sample_keys}
+            return {
+                k: StructureNavigator._get_sample(data[k], 1)
+                for k in islice(data, max_items)
+            }
         elif isinstance(data, list):
             return [StructureNavigator._get_sample(item, 1) for item in data[:max_items]]
         elif isinstance(data, str) and len(data) > 100:
@@ -385,13 +458,13 @@ class StructureNavigator:
         if isinstance(data, list):
             stats["count"] = len(data)
             if data and isinstance(data[0], dict):
-                stats["fields"] = list(data[0].keys())[:10]
+                stats["fields"] = list(islice(data[0], 10))
         elif isinstance(data, dict):
             stats["field_count"] = len(data)
-            stats["field_names"] = list(data.keys())[:20]
+            stats["field_names"] = list(islice(data, 20))
         elif isinstance(data, str):
             stats["length"] = len(data)
-            stats["lines"] = len(data.split("\n"))
+            stats["lines"] = data.count("\n") + 1
             stats["words"] = len(data.split())
         return stats
 
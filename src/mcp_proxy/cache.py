@@ -1,16 +1,20 @@
 """
 Smart caching module for MCP-RLM Proxy.
 
-Provides TTL-based, size-aware caching with UUID-based keys for
+Provides TTL-based, size-aware caching with short hashed keys for
 storing large tool responses that can be explored incrementally
 by agents via proxy tools.
 """
 
 import asyncio
+import hashlib
+import heapq
+import itertools
+import os
 import time
-import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, runtime_checkable
 
 from mcp.types import Content, TextContent
 
@@ -18,6 +22,19 @@ from mcp_proxy.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_CACHE_ID_KEY = os.urandom(16)
+_cache_id_counter = itertools.count()
+
+
+def _new_cache_id() -> str:
+    """Return a short (12 hex chars) cache ID.
+
+    Keyed BLAKE2b over a process-wide counter: one digest per call instead
+    of a trip to the OS random source, yet IDs stay unguessable.
+    """
+    counter = next(_cache_id_counter).to_bytes(8, "little")
+    return hashlib.blake2b(counter, digest_size=6, key=_CACHE_ID_KEY).hexdigest()
+
 
 @runtime_checkable
 class AsyncCacheManager(Protocol):
@@ -60,16 +77,18 @@ class CacheEntry:
     last_accessed_at: float
     access_count: int = 0
     size_bytes: int = 0
+    # Clock the timestamps above come from (the owning cache's)
+    time_fn: Callable[[], float] = field(default=time.monotonic, repr=False, compare=False)
 
     @property
     def age_seconds(self) -> float:
         """Seconds since this entry was created."""
-        return time.monotonic() - self.created_at
+        return self.time_fn() - self.created_at
 
     @property
     def idle_seconds(self) -> float:
         """Seconds since this entry was last accessed."""
-        return time.monotonic() - self.last_accessed_at
+        return self.time_fn() - self.last_accessed_at
 
 
 class SmartCacheManager:
@@ -77,7 +96,7 @@ class SmartCacheManager:
     Manages caching of tool outputs for efficient recursive exploration.
 
     Features:
-    - UUID-based cache IDs (short, collision-free)
+    - Short hashed cache IDs (keyed BLAKE2b over a counter)
     - TTL-based expiration
     - Size-aware LRU eviction (large idle entries evicted first)
     - Thread-safe access counting
@@ -90,6 +109,7 @@ class SmartCacheManager:
         self,
         max_entries: int = 50,
         ttl_seconds: int = 300,
+        time_fn: Callable[[], float] = time.monotonic,
     ):
         """
         Initialise the cache manager.
@@ -97,10 +117,13 @@ class SmartCacheManager:
         Args:
             max_entries: Maximum number of cache entries.
             ttl_seconds: Time-to-live in seconds for each entry.
+            time_fn: Monotonic clock used for TTL and idle time (injectable
+                so tests can advance time without sleeping).
         """
         self._entries: Dict[str, CacheEntry] = {}
         self.max_entries = max_entries
         self.ttl_seconds = ttl_seconds
+        self._now = time_fn
         self._lock = asyncio.Lock()  # Async lock for thread-safe access
 
     # ------------------------------------------------------------------
@@ -109,7 +132,7 @@ class SmartCacheManager:
 
     async def put(self, content: List[Content], tool_name: str, arguments: Dict[str, Any]) -> str:
         """
-        Store content and return a short UUID-based cache_id.
+        Store content and return a short cache_id.
 
         Args:
             content: MCP Content list to cache.
@@ -117,14 +140,14 @@ class SmartCacheManager:
             arguments: Original arguments used for the tool call.
 
         Returns:
-            A short cache ID string (first 12 chars of UUID4).
+            A short cache ID string (12 hex chars).
         """
         async with self._lock:
             self._evict_expired()
             self._evict_if_full()
 
-            cache_id = uuid.uuid4().hex[:12]
-            now = time.monotonic()
+            cache_id = _new_cache_id()
+            now = self._now()
             size_bytes = sum(
                 len(item.text) for item in content if isinstance(item, TextContent)
             )
@@ -138,6 +161,7 @@ class SmartCacheManager:
                 last_accessed_at=now,
                 access_count=0,
                 size_bytes=size_bytes,
+                time_fn=self._now,
             )
             self._entries[cache_id] = entry
             logger.debug(
@@ -159,13 +183,14 @@ class SmartCacheManager:
             if entry is None:
                 return None
 
-            if entry.age_seconds > self.ttl_seconds:
+            now = self._now()
+            if now - entry.created_at > self.ttl_seconds:
                 del self._entries[cache_id]
-                logger.debug("Cache entry %s expired (age=%.1fs)", cache_id, entry.age_seconds)
+                logger.debug("Cache entry %s expired (age=%.1fs)", cache_id, now - entry.created_at)
                 return None
 
             entry.access_count += 1
-            entry.last_accessed_at = time.monotonic()
+            entry.last_accessed_at = now
             logger.debug(
                 "Cache hit for %s (access #%d)", cache_id, entry.access_count
             )
@@ -182,12 +207,13 @@ class SmartCacheManager:
             if entry is None:
                 return None
 
-            if entry.age_seconds > self.ttl_seconds:
+            now = self._now()
+            if now - entry.created_at > self.ttl_seconds:
                 del self._entries[cache_id]
                 return None
 
             entry.access_count += 1
-            entry.last_accessed_at = time.monotonic()
+            entry.last_accessed_at = now
             return entry
 
     async def remove(self, cache_id: str) -> bool:
@@ -222,11 +248,13 @@ class SmartCacheManager:
 
     def _evict_expired(self) -> None:
         """Remove all entries that have exceeded TTL."""
-        expired = [
-            cid
-            for cid, entry in self._entries.items()
-            if entry.age_seconds > self.ttl_seconds
-        ]
+        now = self._now()
+        expired: List[str] = []
+        # Entries are stored in creation order, so expired ones form a prefix
+        for cid, entry in self._entries.items():
+            if now - entry.created_at <= self.ttl_seconds:
+                break
+            expired.append(cid)
         for cid in expired:
             del self._entries[cid]
         if expired:
@@ -235,24 +263,32 @@ class SmartCacheManager:
     def _evict_if_full(self) -> None:
         """Evict entries until we are below max_entries.
 
-        Strategy: evict the entry with the highest ``idle_seconds * size_bytes``
-        score first (large idle entries go first).
+        Strategy: evict the entries with the highest ``idle_seconds * size_bytes``
+        score first (large idle entries go first). The score changes as time
+        passes, so rather than maintaining a heap we score everything once
+        and evict a batch (~10% of capacity), amortising the O(N) pass over
+        the next several puts.
         """
-        while len(self._entries) >= self.max_entries:
-            if not self._entries:
-                break
-            # Score = idle time × size  (bigger & older → evicted first)
-            worst_id = max(
-                self._entries,
-                key=lambda cid: self._entries[cid].idle_seconds * max(self._entries[cid].size_bytes, 1),
-            )
+        overflow = len(self._entries) - self.max_entries + 1
+        if overflow <= 0 or not self._entries:
+            return
+        count = min(len(self._entries), max(overflow, self.max_entries // 10))
+
+        now = self._now()
+        # Score = idle time × size  (bigger & older → evicted first)
+        victims = heapq.nlargest(
+            count,
+            self._entries.values(),
+            key=lambda e: (now - e.last_accessed_at) * max(e.size_bytes, 1),
+        )
+        for entry in victims:
             logger.debug(
                 "Evicting cache entry %s (idle=%.1fs, size=%d bytes)",
-                worst_id,
-                self._entries[worst_id].idle_seconds,
-                self._entries[worst_id].size_bytes,
+                entry.cache_id,
+                now - entry.last_accessed_at,
+                entry.size_bytes,
             )
-            del self._entries[worst_id]
+            del self._entries[entry.cache_id]
 
     async def size_async(self) -> int:
         """Thread-safe async version of size property."""
@@ -279,6 +315,70 @@ class SmartCacheManager:
         return await self.stats_async()
 
 
+# ---------------------------------------------------------------------------
+# Bounded TTL mapping
+# ---------------------------------------------------------------------------
+
+class TTLMapping:
+    """
+    Small bounded key/value map whose entries expire after a TTL.
+
+    Used for bookkeeping that must not grow without bound in a long-running
+    proxy (e.g. session → agent ID assignments). Entries expire
+    ``ttl_seconds`` after their last access; when ``maxsize`` is reached
+    the least recently used entry is dropped. Not async-locked: every
+    operation completes without awaiting.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: float,
+        time_fn: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._now = time_fn
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, touched_at = item
+        now = self._now()
+        if now - touched_at > self.ttl_seconds:
+            del self._data[key]
+            return default
+        self._data[key] = (value, now)
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        now = self._now()
+        self._data[key] = (value, now)
+        self._data.move_to_end(key)
+        self._expire(now)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: object) -> bool:
+        # Membership only: unlike get(), does not refresh the TTL or LRU order
+        item = self._data.get(key)  # type: ignore[arg-type]
+        return item is not None and self._now() - item[1] <= self.ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _expire(self, now: float) -> None:
+        """Drop expired entries from the LRU end (oldest first)."""
+        while self._data:
+            key, (_, touched_at) = next(iter(self._data.items()))
+            if now - touched_at <= self.ttl_seconds:
+                break
+            del self._data[key]
+
+
 # ---------------------------------------------------------------------------
 # Agent-aware cache manager
 # ---------------------------------------------------------------------------
@@ -312,6 +412,7 @@ class AgentAwareCacheManager:
         ttl_seconds: int = 300,
         max_total_agents: int = 1000,
         enable_agent_isolation: bool = True,
+        time_fn: Callable[[], float] = time.monotonic,
     ):
         """
         Initialize agent-aware cache manager.
@@ -322,12 +423,15 @@ class AgentAwareCacheManager:
             ttl_seconds: Time-to-live for cache entries.
             max_total_agents: Maximum number of concurrent agent caches.
             enable_agent_isolation: If False, all agents share one cache (backward compat).
+            time_fn: Monotonic clock for TTL, idle and agent LRU bookkeeping;
+                shared with every per-agent cache.
         """
         self.max_entries_per_agent = max_entries_per_agent
         self.max_memory_per_agent = max_memory_per_agent
         self.ttl_seconds = ttl_seconds
         self.max_total_agents = max_total_agents
         self.enable_agent_isolation = enable_agent_isolation
+        self._now = time_fn
 
         # Agent-specific caches
         self._agent_caches: Dict[str, AgentCacheInfo] = {}
@@ -338,6 +442,7 @@ class AgentAwareCacheManager:
             self._shared_cache = SmartCacheManager(
                 max_entries=max_entries_per_agent * 10,  # Scale up for shared
                 ttl_seconds=ttl_seconds,
+                time_fn=time_fn,
             )
 
     async def put(
@@ -382,7 +487,7 @@ class AgentAwareCacheManager:
                 self.max_memory_per_agent,
             )
             # Return a cache_id anyway, but it won't be stored
-            return f"{agent_id}:{uuid.uuid4().hex[:12]}"
+            return f"{agent_id}:{_new_cache_id()}"
 
         # Get or create agent-specific cache
         async with self._global_lock:
@@ -397,16 +502,17 @@ class AgentAwareCacheManager:
                 agent_cache = SmartCacheManager(
                     max_entries=self.max_entries_per_agent,
                     ttl_seconds=self.ttl_seconds,
+                    time_fn=self._now,
                 )
                 agent_info = AgentCacheInfo(
                     agent_id=agent_id,
                     cache=agent_cache,
-                    last_accessed_at=time.monotonic(),
+                    last_accessed_at=self._now(),
                 )
                 self._agent_caches[agent_id] = agent_info
                 logger.debug("Created cache for agent: %s", agent_id)
             
-            agent_info.last_accessed_at = time.monotonic()
+            agent_info.last_accessed_at = self._now()
 
         # Check memory limit for this agent
         async with agent_info.cache._lock:
@@ -468,7 +574,7 @@ class AgentAwareCacheManager:
             if agent_info is None:
                 logger.debug("Agent cache not found: %s", agent_id)
                 return None
-            agent_info.last_accessed_at = time.monotonic()
+            agent_info.last_accessed_at = self._now()
 
         # Retrieve from agent's cache
         result = await agent_info.cache.get(actual_cache_id)
@@ -611,7 +717,7 @@ class AgentAwareCacheManager:
         logger.info(
             "Evicting agent cache: %s (last accessed: %.1fs ago, entries: %d)",
             oldest_agent_id,
-            time.monotonic() - agent_info.last_accessed_at,
+            self._now() - agent_info.last_accessed_at,
             await agent_info.cache.size_async(),
         )
 
@@ -624,10 +730,11 @@ class AgentAwareCacheManager:
             return
 
         # Smart eviction: prioritize large, idle, rarely-accessed entries
+        now = self._now()
         worst_id = max(
             agent_info.cache._entries,
             key=lambda cid: (
-                agent_info.cache._entries[cid].idle_seconds
+                (now - agent_info.cache._entries[cid].last_accessed_at)
                 * agent_info.cache._entries[cid].size_bytes
                 / max(agent_info.cache._entries[cid].access_count, 1)
             ),
@@ -638,7 +745,7 @@ class AgentAwareCacheManager:
             "Evicting entry %s from agent %s (idle=%.1fs, size=%d bytes, accesses=%d)",
             worst_id,
             agent_info.agent_id,
-            entry.idle_seconds,
+            now - entry.last_accessed_at,
             entry.size_bytes,
             entry.access_count,
         )
@@ -55,6 +55,15 @@ class ProxySettings:
     max_total_agents: int = 1000
     """Maximum number of concurrent agent caches."""
 
+    session_pool_size: int = 1
+    """Sessions opened per underlying server; tool calls are spread round-robin.
+
+    Every session is its own server subprocess and consecutive calls go to
+    different ones, so only use values above 1 with servers that keep no
+    state between calls. A session whose connection dies is replaced in the
+    background after the first call that fails on it.
+    """
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ProxySettings":
         return cls(
@@ -66,6 +75,7 @@ class ProxySettings:
             max_entries_per_agent=data.get("maxEntriesPerAgent", cls.max_entries_per_agent),
             max_memory_per_agent=data.get("maxMemoryPerAgent", cls.max_memory_per_agent),
             max_total_agents=data.get("maxTotalAgents", cls.max_total_agents),
+            session_pool_size=data.get("sessionPoolSize", cls.session_pool_size),
         )
 
 
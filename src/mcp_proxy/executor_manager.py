@@ -2,11 +2,14 @@
 Executor manager for offloading CPU-bound operations to thread pool.
 
 Prevents blocking the event loop during intensive computations like
-BM25 ranking, fuzzy matching, and JSON parsing.
+BM25 ranking, fuzzy matching, and JSON parsing.  Pure-Python work that
+holds the GIL for long stretches can instead be sent to a lazily-created
+process pool.
 """
 
 import asyncio
 import concurrent.futures
+import multiprocessing
 import os
 from typing import Any, Callable, Optional
 
@@ -14,6 +17,13 @@ from mcp_proxy.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# "forkserver" is POSIX-only; fall back to "spawn" elsewhere (e.g. Windows)
+_PROCESS_START_METHOD = (
+    "forkserver"
+    if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn"
+)
+
 
 class ExecutorManager:
     """Manages thread pool executor for CPU-bound operations."""
@@ -33,8 +43,26 @@ class ExecutorManager:
             thread_name_prefix="mcp-cpu-worker"
         )
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
         logger.info("ExecutorManager initialized with %d workers", max_workers)
 
+    @property
+    def process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Process pool for GIL-bound work, created on first use.
+
+        Workers are started with ``forkserver`` rather than ``fork``: the proxy
+        runs an event loop and helper threads, which a forked child would
+        inherit in an inconsistent state.
+        """
+        if self._process_pool is None:
+            workers = max(1, (os.cpu_count() or 2) // 2)
+            self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(_PROCESS_START_METHOD),
+            )
+            logger.debug("Process pool started with %d workers", workers)
+        return self._process_pool
+
     def set_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         """Set the event loop for executor operations."""
         self._loop = loop
@@ -56,7 +84,7 @@ class ExecutorManager:
         Returns:
             Result of func(*args, **kwargs)
         """
-        loop = self._loop or asyncio.get_event_loop()
+        loop = self._loop or asyncio.get_running_loop()
         
         # If function accepts kwargs, use functools.partial
         if kwargs:
@@ -65,8 +93,20 @@ class ExecutorManager:
         
         return await loop.run_in_executor(self.executor, func, *args)
 
+    async def run_in_process(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a picklable, module-level function in the process pool.
+
+        Only worth it for large inputs; arguments and results are pickled.
+        """
+        loop = self._loop or asyncio.get_running_loop()
+        return await loop.run_in_executor(self.process_pool, func, *args)
+
     def shutdown(self, wait: bool = True) -> None:
         """Shutdown the executor."""
         logger.debug("Shutting down executor (wait=%s)", wait)
         self.executor.shutdown(wait=wait)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
 
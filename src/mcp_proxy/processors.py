@@ -11,8 +11,12 @@ from __future__ import annotations
 import asyncio
 import json
 import re
+import sys
+import weakref
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Dict, List, Optional, Tuple
 
 from mcp.types import Content, ImageContent, TextContent
@@ -28,6 +32,34 @@ from mcp_proxy.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Pattern features whose meaning changes when matched against a whole text
+# rather than a single line (lookarounds, atomic/possessive, absolute anchors)
+_LINE_SENSITIVE_RE = re.compile(r"\(\?(?:<?[=!]|>)|[*+?}]\+|\\[AZ]")
+
+# Hits after which a whole-text grep sweep may hand over to the per-line loop
+_DENSE_HITS = 64
+
+# Regex metacharacters other than "|"; a pattern without any is an
+# alternation of plain literals
+_REGEX_META_RE = re.compile(r"[.^$*+?{}\[\]\\()]")
+
+# Texts shorter than this are processed inline by the async paths; a
+# thread-pool hop costs more than scanning them
+_OFFLOAD_MIN_CHARS = 10_000
+
+# Decoded JSON of TextContent the processors emitted, keyed by id(); see
+# ``_remember_parsed``
+_PARSED_JSON: Dict[int, Any] = {}
+_NOT_PARSED = object()
+
+# Cheap sniff for a JSON object/array; anything else skips json.loads
+# (``\s`` covers every JSON whitespace character, so no container is missed)
+_JSON_CONTAINER_START_RE = re.compile(r"\s*[\[{]")
+
+# Same for any JSON value json.loads accepts (incl. NaN/Infinity); text
+# failing this cannot parse, so the attempt and its exception are skipped
+_JSON_VALUE_START_RE = re.compile(r'\s*[\[{"\-0-9tfnNI]')
+
 
 # ---------------------------------------------------------------------------
 # Result container
@@ -80,11 +112,12 @@ class BaseProcessor(ABC):
         Override in subclasses to provide async implementation.
         """
         # Default: run sync version in executor if available
-        if hasattr(self, 'executor_manager') and self.executor_manager:
+        executor_manager = getattr(self, 'executor_manager', None)
+        if executor_manager:
             from functools import partial
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             return await loop.run_in_executor(
-                self.executor_manager.executor,
+                executor_manager.executor,
                 partial(self.process, content, spec)
             )
         return self.process(content, spec)
@@ -186,38 +219,42 @@ class ProjectionProcessor(BaseProcessor):
         if not isinstance(data, dict):
             return data
 
-        if mode == "include":
-            return ProjectionProcessor._apply_include(data, fields, projection, path)
-        elif mode == "exclude":
-            return ProjectionProcessor._apply_exclude(data, fields, projection, path)
-        elif mode == "view":
-            view_fields = projection.get("view", fields[0] if fields else "default")  # noqa: F841
-            return ProjectionProcessor.apply_projection(
-                data, {"mode": "include", "fields": fields}
-            )
-
-        return data
+        handler = ProjectionProcessor._MODE_HANDLERS.get(mode)
+        if handler is None:
+            return data
+        return handler(data, fields, projection, path)
 
     @staticmethod
     def project_content(
         content: List[Content], projection: Dict[str, Any]
     ) -> List[Content]:
-        """Apply projection to MCP Content objects."""
+        """Apply projection to MCP Content objects.
+
+        Items the projection leaves unchanged are returned as-is, keeping their
+        original formatting; only items that lost fields are re-encoded (as
+        indented JSON).
+        """
         projected: List[Content] = []
         for item in content:
             if isinstance(item, TextContent):
+                if not _JSON_CONTAINER_START_RE.match(item.text):
+                    # Plain text (or a JSON scalar): nothing to project
+                    projected.append(item)
+                    continue
                 try:
-                    data = json.loads(item.text)
+                    data = _load_json(item)
                     if isinstance(data, (dict, list)):
                         projected_data = ProjectionProcessor.apply_projection(
                             data, projection
                         )
-                        projected.append(
-                            TextContent(
-                                type="text",
-                                text=json.dumps(projected_data, indent=2),
-                            )
-                        )
+                        if projected_data == data:
+                            # Nothing removed: keep the original, skip re-encoding
+                            projected.append(item)
+                            continue
+                        projected.append(_remember_parsed(
+                            _text_content(json.dumps(projected_data, indent=2)),
+                            projected_data,
+                        ))
                     else:
                         projected.append(item)
                 except json.JSONDecodeError:
@@ -236,12 +273,18 @@ class ProjectionProcessor(BaseProcessor):
         
         for item in content:
             if isinstance(item, TextContent):
+                if not _JSON_CONTAINER_START_RE.match(item.text):
+                    # Plain text (or a JSON scalar): nothing to project
+                    projected.append(item)
+                    continue
                 try:
-                    # Offload JSON parsing to thread pool
-                    if self.executor_manager:
-                        data = await self.executor_manager.run_cpu_bound(json.loads, item.text)
-                    else:
-                        data = json.loads(item.text)
+                    data = _PARSED_JSON.get(id(item), _NOT_PARSED)
+                    if data is _NOT_PARSED:
+                        # Offload JSON parsing to thread pool
+                        if self.executor_manager:
+                            data = await self.executor_manager.run_cpu_bound(json.loads, item.text)
+                        else:
+                            data = json.loads(item.text)
                     
                     if isinstance(data, (dict, list)):
                         # Projection itself can be CPU-bound for large structures
@@ -251,15 +294,25 @@ class ProjectionProcessor(BaseProcessor):
                                 data,
                                 projection
                             )
+                        else:
+                            projected_data = self.apply_projection(data, projection)
+
+                        if projected_data == data:
+                            # Nothing removed: keep the original, skip re-encoding
+                            projected.append(item)
+                            continue
+
+                        if self.executor_manager:
                             projected_text = await self.executor_manager.run_cpu_bound(
                                 lambda d: json.dumps(d, indent=2),
                                 projected_data
                             )
                         else:
-                            projected_data = self.apply_projection(data, projection)
                             projected_text = json.dumps(projected_data, indent=2)
                         
-                        projected.append(TextContent(type="text", text=projected_text))
+                        projected.append(
+                            _remember_parsed(_text_content(projected_text), projected_data)
+                        )
                     else:
                         projected.append(item)
                 except json.JSONDecodeError:
@@ -281,21 +334,32 @@ class ProjectionProcessor(BaseProcessor):
         path: str,
     ) -> Dict[str, Any]:
         """Include-mode projection."""
+        compiled, flat = _compile_include_fields(tuple(fields))
+        if flat:
+            # Top-level keys only: no dotted paths to resolve
+            return {
+                fld: ProjectionProcessor.apply_projection(
+                    data[fld], projection, f"{path}.{fld}" if path else fld
+                )
+                if isinstance(data[fld], (dict, list))
+                else data[fld]
+                for fld in fields
+                if fld in data
+            }
+
         # Separate array projections from regular fields
         array_projections: Dict[str, List[str]] = {}
-        regular_fields: List[str] = []
+        regular_fields: List[Tuple[str, Optional[Tuple[str, ...]]]] = []
 
-        for fld in fields:
-            if "." in fld:
-                parts = fld.split(".")
+        for fld, parts, nested_field in compiled:
+            if parts is not None:
                 parent_key = parts[0]
-                nested_field = ".".join(parts[1:])
                 if parent_key in data and isinstance(data[parent_key], list):
                     array_projections.setdefault(parent_key, []).append(nested_field)
                 else:
-                    regular_fields.append(fld)
+                    regular_fields.append((fld, parts))
             else:
-                regular_fields.append(fld)
+                regular_fields.append((fld, None))
 
         result: Dict[str, Any] = {}
 
@@ -308,7 +372,7 @@ class ProjectionProcessor(BaseProcessor):
                 )
 
         # Regular fields
-        for fld in regular_fields:
+        for fld, parts in regular_fields:
             if fld in data:
                 value = data[fld]
                 if isinstance(value, (dict, list)):
@@ -317,8 +381,7 @@ class ProjectionProcessor(BaseProcessor):
                     )
                 else:
                     result[fld] = value
-            elif "." in fld:
-                parts = fld.split(".")
+            elif parts is not None:
                 current = data
                 for part in parts[:-1]:
                     if isinstance(current, dict) and part in current:
@@ -350,25 +413,27 @@ class ProjectionProcessor(BaseProcessor):
         path: str,
     ) -> Dict[str, Any]:
         """Exclude-mode projection."""
+        excluded, nested_by_key = _compile_exclude_fields(tuple(fields))
+        if not nested_by_key:
+            # Top-level keys only: drop them and recurse into the rest
+            return {
+                key: ProjectionProcessor.apply_projection(
+                    value, projection, f"{path}.{key}" if path else key
+                )
+                if isinstance(value, (dict, list))
+                else value
+                for key, value in data.items()
+                if key not in excluded
+            }
+
         result: Dict[str, Any] = {}
         for key, value in data.items():
-            if key in fields:
-                continue
-
-            should_exclude_key = False
-            nested_exclusions: List[str] = []
-            for fld in fields:
-                if fld == key:
-                    should_exclude_key = True
-                    break
-                elif fld.startswith(f"{key}."):
-                    nested_exclusions.append(fld[len(key) + 1:])
-
-            if should_exclude_key:
+            if key in excluded:
                 continue
 
+            nested_exclusions = nested_by_key.get(key)
             if nested_exclusions:
-                nested_proj = {"mode": "exclude", "fields": nested_exclusions}
+                nested_proj = {"mode": "exclude", "fields": list(nested_exclusions)}
                 if isinstance(value, (dict, list)):
                     result[key] = ProjectionProcessor.apply_projection(
                         value, nested_proj, f"{path}.{key}" if path else key
@@ -385,6 +450,25 @@ class ProjectionProcessor(BaseProcessor):
 
         return result
 
+    @staticmethod
+    def _apply_view(
+        data: Dict[str, Any],
+        fields: List[str],
+        projection: Dict[str, Any],
+        path: str,
+    ) -> Dict[str, Any]:
+        """View-mode projection (currently an include of *fields*)."""
+        return ProjectionProcessor._apply_include(
+            data, fields, {"mode": "include", "fields": fields}, ""
+        )
+
+    # Mode -> handler, looked up once per dict instead of an if/elif ladder
+    _MODE_HANDLERS: Dict[str, Any] = {
+        "include": _apply_include,
+        "exclude": _apply_exclude,
+        "view": _apply_view,
+    }
+
 
 # ---------------------------------------------------------------------------
 # Grep processor
@@ -477,10 +561,9 @@ class GrepProcessor(BaseProcessor):
         handler = self._strategies.get(search_mode)
         if handler is None:
             return [
-                TextContent(
-                    type="text",
-                    text=f"Error: Unknown search mode '{search_mode}'. "
-                    f"Supported: {', '.join(self._strategies)}",
+                _text_content(
+                    f"Error: Unknown search mode '{search_mode}'. "
+                    f"Supported: {', '.join(self._strategies)}"
                 )
             ]
         return handler(content, grep_spec)
@@ -493,10 +576,9 @@ class GrepProcessor(BaseProcessor):
         handler = self._async_strategies.get(search_mode)
         if handler is None:
             return [
-                TextContent(
-                    type="text",
-                    text=f"Error: Unknown search mode '{search_mode}'. "
-                    f"Supported: {', '.join(self._async_strategies)}",
+                _text_content(
+                    f"Error: Unknown search mode '{search_mode}'. "
+                    f"Supported: {', '.join(self._async_strategies)}"
                 )
             ]
         return await handler(content, grep_spec)
@@ -511,28 +593,27 @@ class GrepProcessor(BaseProcessor):
         chunk_size = grep_spec.get("chunkSize", 500)
 
         if not query:
-            return [TextContent(type="text", text="Error: BM25 search requires 'query' parameter")]
+            return [_message_content("Error: BM25 search requires 'query' parameter")]
 
         results: List[Content] = []
         for item in content:
             if not isinstance(item, TextContent):
                 continue
             text = item.text
-            try:
-                data = json.loads(text)
-                text = json.dumps(data, indent=2)
-            except json.JSONDecodeError:
-                pass
+            # An earlier stage's output is already rendered with indent=2
+            if id(item) not in _PARSED_JSON and _JSON_VALUE_START_RE.match(text):
+                try:
+                    data = json.loads(text)
+                    text = json.dumps(data, indent=2)
+                except json.JSONDecodeError:
+                    pass
 
             ranked_chunks = self.bm25.rank_chunks(text, query, chunk_size, top_k)
             if ranked_chunks:
-                result_text = f"BM25 Search Results (query: '{query}', top {len(ranked_chunks)} of {top_k}):\n\n"
-                for i, chunk_data in enumerate(ranked_chunks, 1):
-                    result_text += f"=== Result {i} (Score: {chunk_data['score']:.4f}) ===\n"
-                    result_text += f"{chunk_data['chunk']}\n\n"
-                results.append(TextContent(type="text", text=result_text))
+                result_text = self._format_bm25_results(query, top_k, ranked_chunks)
+                results.append(_text_content(result_text))
 
-        return results if results else [TextContent(type="text", text="No relevant results found.")]
+        return results if results else [_message_content("No relevant results found.")]
 
     async def _apply_bm25_search_async(
         self, content: List[Content], grep_spec: Dict[str, Any]
@@ -543,7 +624,7 @@ class GrepProcessor(BaseProcessor):
         chunk_size = grep_spec.get("chunkSize", 500)
 
         if not query:
-            return [TextContent(type="text", text="Error: BM25 search requires 'query' parameter")]
+            return [_message_content("Error: BM25 search requires 'query' parameter")]
 
         results: List[Content] = []
         for item in content:
@@ -551,18 +632,20 @@ class GrepProcessor(BaseProcessor):
                 continue
             
             text = item.text
-            try:
-                # Offload JSON parsing
-                if self.executor_manager:
-                    data = await self.executor_manager.run_cpu_bound(json.loads, text)
-                    text = await self.executor_manager.run_cpu_bound(
-                        lambda d: json.dumps(d, indent=2), data
-                    )
-                else:
-                    data = json.loads(text)
-                    text = json.dumps(data, indent=2)
-            except json.JSONDecodeError:
-                pass
+            # An earlier stage's output is already rendered with indent=2
+            if id(item) not in _PARSED_JSON and _JSON_VALUE_START_RE.match(text):
+                try:
+                    # Offload JSON parsing
+                    if self.executor_manager:
+                        data = await self.executor_manager.run_cpu_bound(json.loads, text)
+                        text = await self.executor_manager.run_cpu_bound(
+                            lambda d: json.dumps(d, indent=2), data
+                        )
+                    else:
+                        data = json.loads(text)
+                        text = json.dumps(data, indent=2)
+                except json.JSONDecodeError:
+                    pass
 
             # Offload BM25 ranking to thread pool
             if self.executor_manager:
@@ -577,13 +660,10 @@ class GrepProcessor(BaseProcessor):
                 ranked_chunks = self.bm25.rank_chunks(text, query, chunk_size, top_k)
             
             if ranked_chunks:
-                result_text = f"BM25 Search Results (query: '{query}', top {len(ranked_chunks)} of {top_k}):\n\n"
-                for i, chunk_data in enumerate(ranked_chunks, 1):
-                    result_text += f"=== Result {i} (Score: {chunk_data['score']:.4f}) ===\n"
-                    result_text += f"{chunk_data['chunk']}\n\n"
-                results.append(TextContent(type="text", text=result_text))
+                result_text = self._format_bm25_results(query, top_k, ranked_chunks)
+                results.append(_text_content(result_text))
 
-        return results if results else [TextContent(type="text", text="No relevant results found.")]
+        return results if results else [_message_content("No relevant results found.")]
 
     def _apply_fuzzy_search(
         self, content: List[Content], grep_spec: Dict[str, Any]
@@ -593,7 +673,7 @@ class GrepProcessor(BaseProcessor):
         max_matches = grep_spec.get("maxMatches", 10)
 
         if not pattern:
-            return [TextContent(type="text", text="Error: Fuzzy search requires 'pattern' parameter")]
+            return [_message_content("Error: Fuzzy search requires 'pattern' parameter")]
 
         results: List[Content] = []
         for item in content:
@@ -601,14 +681,10 @@ class GrepProcessor(BaseProcessor):
                 continue
             matches = self.fuzzy.fuzzy_search(item.text, pattern, threshold, max_matches)
             if matches:
-                result_text = f"Fuzzy Search Results (pattern: '{pattern}', threshold: {threshold}):\n\n"
-                for i, match in enumerate(matches, 1):
-                    result_text += f"=== Match {i} (Similarity: {match['similarity']:.2%}) ===\n"
-                    result_text += f"Found: \"{match['match']}\"\n"
-                    result_text += f"Context: ...{match['context']}...\n\n"
-                results.append(TextContent(type="text", text=result_text))
+                result_text = self._format_fuzzy_results(pattern, threshold, matches)
+                results.append(_text_content(result_text))
 
-        return results if results else [TextContent(type="text", text="No fuzzy matches found.")]
+        return results if results else [_message_content("No fuzzy matches found.")]
 
     async def _apply_fuzzy_search_async(
         self, content: List[Content], grep_spec: Dict[str, Any]
@@ -619,7 +695,7 @@ class GrepProcessor(BaseProcessor):
         max_matches = grep_spec.get("maxMatches", 10)
 
         if not pattern:
-            return [TextContent(type="text", text="Error: Fuzzy search requires 'pattern' parameter")]
+            return [_message_content("Error: Fuzzy search requires 'pattern' parameter")]
 
         results: List[Content] = []
         for item in content:
@@ -639,14 +715,10 @@ class GrepProcessor(BaseProcessor):
                 matches = self.fuzzy.fuzzy_search(item.text, pattern, threshold, max_matches)
             
             if matches:
-                result_text = f"Fuzzy Search Results (pattern: '{pattern}', threshold: {threshold}):\n\n"
-                for i, match in enumerate(matches, 1):
-                    result_text += f"=== Match {i} (Similarity: {match['similarity']:.2%}) ===\n"
-                    result_text += f"Found: \"{match['match']}\"\n"
-                    result_text += f"Context: ...{match['context']}...\n\n"
-                results.append(TextContent(type="text", text=result_text))
+                result_text = self._format_fuzzy_results(pattern, threshold, matches)
+                results.append(_text_content(result_text))
 
-        return results if results else [TextContent(type="text", text="No fuzzy matches found.")]
+        return results if results else [_message_content("No fuzzy matches found.")]
 
     def _apply_context_search(
         self, content: List[Content], grep_spec: Dict[str, Any]
@@ -656,7 +728,7 @@ class GrepProcessor(BaseProcessor):
         max_matches = grep_spec.get("maxMatches", 5)
 
         if not pattern:
-            return [TextContent(type="text", text="Error: Context search requires 'pattern' parameter")]
+            return [_message_content("Error: Context search requires 'pattern' parameter")]
 
         results: List[Content] = []
         for item in content:
@@ -666,13 +738,10 @@ class GrepProcessor(BaseProcessor):
                 item.text, pattern, context_type, max_matches
             )
             if matches:
-                result_text = f"Context Search Results (pattern: '{pattern}', context: {context_type}):\n\n"
-                for i, match in enumerate(matches, 1):
-                    result_text += f"=== {context_type.capitalize()} {i} ({match['matches']} match(es)) ===\n"
-                    result_text += f"{match['context']}\n\n"
-                results.append(TextContent(type="text", text=result_text))
+                result_text = self._format_context_results(pattern, context_type, matches)
+                results.append(_text_content(result_text))
 
-        return results if results else [TextContent(type="text", text="No contextual matches found.")]
+        return results if results else [_message_content("No contextual matches found.")]
 
     async def _apply_context_search_async(
         self, content: List[Content], grep_spec: Dict[str, Any]
@@ -683,7 +752,7 @@ class GrepProcessor(BaseProcessor):
         max_matches = grep_spec.get("maxMatches", 5)
 
         if not pattern:
-            return [TextContent(type="text", text="Error: Context search requires 'pattern' parameter")]
+            return [_message_content("Error: Context search requires 'pattern' parameter")]
 
         results: List[Content] = []
         for item in content:
@@ -705,13 +774,10 @@ class GrepProcessor(BaseProcessor):
                 )
             
             if matches:
-                result_text = f"Context Search Results (pattern: '{pattern}', context: {context_type}):\n\n"
-                for i, match in enumerate(matches, 1):
-                    result_text += f"=== {context_type.capitalize()} {i} ({match['matches']} match(es)) ===\n"
-                    result_text += f"{match['context']}\n\n"
-                results.append(TextContent(type="text", text=result_text))
+                result_text = self._format_context_results(pattern, context_type, matches)
+                results.append(_text_content(result_text))
 
-        return results if results else [TextContent(type="text", text="No contextual matches found.")]
+        return results if results else [_message_content("No contextual matches found.")]
 
     def _apply_structure_navigation(
         self, content: List[Content], grep_spec: Dict[str, Any]
@@ -722,25 +788,13 @@ class GrepProcessor(BaseProcessor):
             if not isinstance(item, TextContent):
                 continue
             try:
-                data = json.loads(item.text)
-                summary = self.navigator.get_structure_summary(data, max_depth)
-                result_text = "Structure Navigation Summary:\n\n"
-                result_text += f"Type: {summary['type']}\n"
-                result_text += f"Size: {json.dumps(summary['size'], indent=2)}\n\n"
-                result_text += f"Structure:\n{json.dumps(summary['keys'], indent=2)}\n\n"
-                result_text += f"Sample Data:\n{json.dumps(summary['sample'], indent=2)}\n\n"
-                result_text += f"Statistics:\n{json.dumps(summary['statistics'], indent=2)}\n"
-                results.append(TextContent(type="text", text=result_text))
+                data = _load_json(item)
+                result_text = self._summarize_structure(data, max_depth)
             except json.JSONDecodeError:
-                text = item.text
-                result_text = "Text Structure Summary:\n\n"
-                result_text += f"Length: {len(text)} characters\n"
-                result_text += f"Lines: {len(text.split(chr(10)))}\n"
-                result_text += f"Words: {len(text.split())}\n"
-                result_text += f"First 200 chars: {text[:200]}...\n"
-                results.append(TextContent(type="text", text=result_text))
+                result_text = self._format_text_summary(item.text)
+            results.append(_text_content(result_text))
 
-        return results if results else [TextContent(type="text", text="No content to navigate.")]
+        return results if results else [_message_content("No content to navigate.")]
 
     async def _apply_structure_navigation_async(
         self, content: List[Content], grep_spec: Dict[str, Any]
@@ -754,58 +808,23 @@ class GrepProcessor(BaseProcessor):
                 continue
             
             try:
-                # Offload JSON parsing and structure analysis
-                if self.executor_manager:
-                    data = await self.executor_manager.run_cpu_bound(json.loads, item.text)
-                    summary = await self.executor_manager.run_cpu_bound(
-                        self.navigator.get_structure_summary,
-                        data,
-                        max_depth
-                    )
-                else:
-                    data = json.loads(item.text)
-                    summary = self.navigator.get_structure_summary(data, max_depth)
-                
-                # JSON dumps can also be CPU-bound for large structures
+                # Offload JSON parsing, then analysis + rendering in one hop
                 if self.executor_manager:
-                    result_text = "Structure Navigation Summary:\n\n"
-                    result_text += f"Type: {summary['type']}\n"
-                    size_str = await self.executor_manager.run_cpu_bound(
-                        lambda s: json.dumps(s, indent=2), summary['size']
-                    )
-                    result_text += f"Size: {size_str}\n\n"
-                    keys_str = await self.executor_manager.run_cpu_bound(
-                        lambda s: json.dumps(s, indent=2), summary['keys']
-                    )
-                    result_text += f"Structure:\n{keys_str}\n\n"
-                    sample_str = await self.executor_manager.run_cpu_bound(
-                        lambda s: json.dumps(s, indent=2), summary['sample']
-                    )
-                    result_text += f"Sample Data:\n{sample_str}\n\n"
-                    stats_str = await self.executor_manager.run_cpu_bound(
-                        lambda s: json.dumps(s, indent=2), summary['statistics']
+                    data = _PARSED_JSON.get(id(item), _NOT_PARSED)
+                    if data is _NOT_PARSED:
+                        data = await self.executor_manager.run_cpu_bound(json.loads, item.text)
+                    result_text = await self.executor_manager.run_cpu_bound(
+                        self._summarize_structure, data, max_depth
                     )
-                    result_text += f"Statistics:\n{stats_str}\n"
                 else:
-                    result_text = "Structure Navigation Summary:\n\n"
-                    result_text += f"Type: {summary['type']}\n"
-                    result_text += f"Size: {json.dumps(summary['size'], indent=2)}\n\n"
-                    result_text += f"Structure:\n{json.dumps(summary['keys'], indent=2)}\n\n"
-                    result_text += f"Sample Data:\n{json.dumps(summary['sample'], indent=2)}\n\n"
-                    result_text += f"Statistics:\n{json.dumps(summary['statistics'], indent=2)}\n"
-                
-                results.append(TextContent(type="text", text=result_text))
+                    data = _load_json(item)
+                    result_text = self._summarize_structure(data, max_depth)
             except json.JSONDecodeError:
                 # For non-JSON text, structure analysis is lightweight
-                text = item.text
-                result_text = "Text Structure Summary:\n\n"
-                result_text += f"Length: {len(text)} characters\n"
-                result_text += f"Lines: {len(text.split(chr(10)))}\n"
-                result_text += f"Words: {len(text.split())}\n"
-                result_text += f"First 200 chars: {text[:200]}...\n"
-                results.append(TextContent(type="text", text=result_text))
+                result_text = self._format_text_summary(item.text)
+            results.append(_text_content(result_text))
 
-        return results if results else [TextContent(type="text", text="No content to navigate.")]
+        return results if results else [_message_content("No content to navigate.")]
 
     def _apply_regex_search(
         self, content: List[Content], grep_spec: Dict[str, Any]
@@ -831,12 +850,11 @@ class GrepProcessor(BaseProcessor):
             flags = re.IGNORECASE if case_insensitive else 0
             if multiline:
                 flags |= re.MULTILINE | re.DOTALL
-            regex = re.compile(pattern, flags)
+            regex = _compile_pattern(pattern, flags)
         except re.error as e:
             return [
-                TextContent(
-                    type="text",
-                    text=f"Error: Invalid regex pattern '{pattern}': {e}",
+                _text_content(
+                    f"Error: Invalid regex pattern '{pattern}': {e}"
                 )
             ]
 
@@ -847,41 +865,33 @@ class GrepProcessor(BaseProcessor):
             if isinstance(item, TextContent):
                 text = item.text
 
-                if target == "structuredContent":
+                if target == "structuredContent" and _JSON_VALUE_START_RE.match(text):
                     try:
-                        data = json.loads(text)
-                        matches = GrepProcessor._search_in_structure(
-                            data, regex, max_matches, match_count
+                        matches, result_text = GrepProcessor._grep_structured(
+                            item, regex, max_matches, match_count
                         )
-                        if matches is not None and matches != {} and matches != []:
-                            filtered.append(
-                                TextContent(type="text", text=json.dumps(matches, indent=2))
-                            )
-                            if isinstance(matches, list):
-                                match_count += len(matches)
-                            elif isinstance(matches, dict):
-                                match_count += GrepProcessor._count_dict_matches(matches)
-                            else:
-                                match_count += 1
+                        if result_text is not None:
+                            filtered.append(_remember_parsed(_text_content(result_text), matches))
+                            match_count += GrepProcessor._structure_match_total(matches)
                     except json.JSONDecodeError:
                         text_matches, match_lines = GrepProcessor._search_in_text(
                             text, regex, max_matches, match_count, context_before, context_after, multiline
                         )
                         if text_matches:
-                            filtered.append(TextContent(type="text", text=text_matches))
+                            filtered.append(_text_content(text_matches))
                             match_count += match_lines
                 else:
                     text_matches, match_lines = GrepProcessor._search_in_text(
                         text, regex, max_matches, match_count, context_before, context_after, multiline
                     )
                     if text_matches:
-                        filtered.append(TextContent(type="text", text=text_matches))
+                        filtered.append(_text_content(text_matches))
                         match_count += match_lines
 
             if max_matches and match_count >= max_matches:
                 break
 
-        return filtered if filtered else [TextContent(type="text", text="No matches found.")]
+        return filtered if filtered else [_message_content("No matches found.")]
 
     async def _apply_regex_search_async(
         self, content: List[Content], grep_spec: Dict[str, Any]
@@ -908,12 +918,11 @@ class GrepProcessor(BaseProcessor):
             flags = re.IGNORECASE if case_insensitive else 0
             if multiline:
                 flags |= re.MULTILINE | re.DOTALL
-            regex = re.compile(pattern, flags)
+            regex = _compile_pattern(pattern, flags)
         except re.error as e:
             return [
-                TextContent(
-                    type="text",
-                    text=f"Error: Invalid regex pattern '{pattern}': {e}",
+                _text_content(
+                    f"Error: Invalid regex pattern '{pattern}': {e}"
                 )
             ]
 
@@ -924,60 +933,30 @@ class GrepProcessor(BaseProcessor):
             if isinstance(item, TextContent):
                 text = item.text
 
-                if target == "structuredContent":
+                # Only large texts are worth a thread hop; small ones run inline
+                offload = self.executor_manager is not None and len(text) > _OFFLOAD_MIN_CHARS
+
+                searched = False
+                if target == "structuredContent" and _JSON_VALUE_START_RE.match(text):
                     try:
-                        # Offload JSON parsing
-                        if self.executor_manager:
-                            data = await self.executor_manager.run_cpu_bound(json.loads, text)
-                            # Offload structured search
-                            matches = await self.executor_manager.run_cpu_bound(
-                                self._search_in_structure,
-                                data,
-                                regex,
-                                max_matches,
-                                match_count
+                        # Parse, search and render in a single hop
+                        if offload:
+                            matches, result_text = await self.executor_manager.run_cpu_bound(
+                                self._grep_structured, item, regex, max_matches, match_count
                             )
                         else:
-                            data = json.loads(text)
-                            matches = self._search_in_structure(data, regex, max_matches, match_count)
-                        
-                        if matches is not None and matches != {} and matches != []:
-                            if self.executor_manager:
-                                result_text = await self.executor_manager.run_cpu_bound(
-                                    lambda m: json.dumps(m, indent=2), matches
-                                )
-                            else:
-                                result_text = json.dumps(matches, indent=2)
-                            filtered.append(TextContent(type="text", text=result_text))
-                            if isinstance(matches, list):
-                                match_count += len(matches)
-                            elif isinstance(matches, dict):
-                                match_count += self._count_dict_matches(matches)
-                            else:
-                                match_count += 1
-                    except json.JSONDecodeError:
-                        # Fallback to text search
-                        if self.executor_manager:
-                            text_matches, match_lines = await self.executor_manager.run_cpu_bound(
-                                self._search_in_text,
-                                text,
-                                regex,
-                                max_matches,
-                                match_count,
-                                context_before,
-                                context_after,
-                                multiline
+                            matches, result_text = self._grep_structured(
+                                item, regex, max_matches, match_count
                             )
-                        else:
-                            text_matches, match_lines = self._search_in_text(
-                                text, regex, max_matches, match_count, context_before, context_after, multiline
-                            )
-                        if text_matches:
-                            filtered.append(TextContent(type="text", text=text_matches))
-                            match_count += match_lines
-                else:
-                    # Offload text search for large texts
-                    if self.executor_manager and len(text) > 10000:
+                        if result_text is not None:
+                            filtered.append(_remember_parsed(_text_content(result_text), matches))
+                            match_count += self._structure_match_total(matches)
+                        searched = True
+                    except json.JSONDecodeError:
+                        pass  # not JSON: fall back to text search
+
+                if not searched:
+                    if offload:
                         text_matches, match_lines = await self.executor_manager.run_cpu_bound(
                             self._search_in_text,
                             text,
@@ -993,13 +972,71 @@ class GrepProcessor(BaseProcessor):
                             text, regex, max_matches, match_count, context_before, context_after, multiline
                         )
                     if text_matches:
-                        filtered.append(TextContent(type="text", text=text_matches))
+                        filtered.append(_text_content(text_matches))
                         match_count += match_lines
 
             if max_matches and match_count >= max_matches:
                 break
 
-        return filtered if filtered else [TextContent(type="text", text="No matches found.")]
+        return filtered if filtered else [_message_content("No matches found.")]
+
+    # -- Result formatting -------------------------------------------------
+    # Each builds a list of parts and joins once, rather than growing a
+    # string with ``+=`` per match.
+
+    def _summarize_structure(self, data: Any, max_depth: int) -> str:
+        """Summarise parsed *data* and render it (one executor hop when async)."""
+        summary = self.navigator.get_structure_summary(data, max_depth)
+        return (
+            "Structure Navigation Summary:\n\n"
+            f"Type: {summary['type']}\n"
+            f"Size: {json.dumps(summary['size'], indent=2)}\n\n"
+            f"Structure:\n{json.dumps(summary['keys'], indent=2)}\n\n"
+            f"Sample Data:\n{json.dumps(summary['sample'], indent=2)}\n\n"
+            f"Statistics:\n{json.dumps(summary['statistics'], indent=2)}\n"
+        )
+
+    @staticmethod
+    def _format_text_summary(text: str) -> str:
+        return (
+            "Text Structure Summary:\n\n"
+            f"Length: {len(text)} characters\n"
+            f"Lines: {text.count(chr(10)) + 1}\n"
+            f"Words: {len(text.split())}\n"
+            f"First 200 chars: {text[:200]}...\n"
+        )
+
+    @staticmethod
+    def _format_bm25_results(
+        query: str, top_k: int, ranked_chunks: List[Dict[str, Any]]
+    ) -> str:
+        parts = [f"BM25 Search Results (query: '{query}', top {len(ranked_chunks)} of {top_k}):\n\n"]
+        for i, chunk_data in enumerate(ranked_chunks, 1):
+            parts.append(f"=== Result {i} (Score: {chunk_data['score']:.4f}) ===\n")
+            parts.append(f"{chunk_data['chunk']}\n\n")
+        return "".join(parts)
+
+    @staticmethod
+    def _format_fuzzy_results(
+        pattern: str, threshold: float, matches: List[Dict[str, Any]]
+    ) -> str:
+        parts = [f"Fuzzy Search Results (pattern: '{pattern}', threshold: {threshold}):\n\n"]
+        for i, match in enumerate(matches, 1):
+            parts.append(f"=== Match {i} (Similarity: {match['similarity']:.2%}) ===\n")
+            parts.append(f"Found: \"{match['match']}\"\n")
+            parts.append(f"Context: ...{match['context']}...\n\n")
+        return "".join(parts)
+
+    @staticmethod
+    def _format_context_results(
+        pattern: str, context_type: str, matches: List[Dict[str, Any]]
+    ) -> str:
+        parts = [f"Context Search Results (pattern: '{pattern}', context: {context_type}):\n\n"]
+        heading = context_type.capitalize()
+        for i, match in enumerate(matches, 1):
+            parts.append(f"=== {heading} {i} ({match['matches']} match(es)) ===\n")
+            parts.append(f"{match['context']}\n\n")
+        return "".join(parts)
 
     # -- Static helpers kept for regex search --------------------------------
 
@@ -1013,62 +1050,164 @@ class GrepProcessor(BaseProcessor):
         context_after: int = 0,
         multiline: bool = False,
     ) -> Tuple[str, int]:
+        remaining = max_matches - current_count if max_matches else None
+        if remaining is not None and remaining <= 0:
+            return "", 0
+
+        # Plain literals none of which are in the text can't match anywhere
+        needles = _literal_alternatives(regex)
+        if needles is not None and not any(needle in text for needle in needles):
+            return "", 0
+
         if multiline:
-            matches = list(regex.finditer(text))
-            if not matches:
-                return "", 0
-            if max_matches:
-                remaining = max_matches - current_count
-                if remaining <= 0:
-                    return "", 0
-                matches = matches[:remaining]
-            result_parts = [m.group(0) for m in matches]
-            return "\n---\n".join(result_parts), len(matches)
+            # Whole-buffer matching: no line split, and stop at the limit
+            # instead of collecting every match first
+            result_parts = [m.group(0) for m in islice(regex.finditer(text), remaining)]
+            return "\n---\n".join(result_parts), len(result_parts)
 
         lines = text.split("\n")
-        matched_line_indices: set[int] = set()
-
-        for i, line in enumerate(lines):
-            if regex.search(line):
-                matched_line_indices.add(i)
 
-        if not matched_line_indices:
+        matched = GrepProcessor._matching_line_indices(text, lines, regex, remaining)
+        if not matched:
             return "", 0
 
-        if max_matches:
-            remaining = max_matches - current_count
-            if remaining <= 0:
-                return "", 0
-            matched_line_indices = set(sorted(matched_line_indices)[:remaining])
+        if not (context_before or context_after):
+            return "\n".join([lines[i] for i in matched]), len(matched)
 
-        included_indices: set[int] = set()
-        result_lines: List[str] = []
+        # Mark every line to keep in a bitmap: one slice write per match
+        # instead of a set insert per context line
+        n_lines = len(lines)
+        keep = bytearray(n_lines)
         actual_match_count = 0
-
-        for match_idx in sorted(matched_line_indices):
-            for i in range(max(0, match_idx - context_before), match_idx):
-                if i not in included_indices:
-                    result_lines.append(lines[i])
-                    included_indices.add(i)
-
-            if match_idx not in included_indices:
-                result_lines.append(lines[match_idx])
-                included_indices.add(match_idx)
+        prev = -1
+        for match_idx in matched:
+            # A match already shown as the previous match's after-context
+            # is not counted again
+            if prev < 0 or match_idx - prev > context_after:
                 actual_match_count += 1
+            prev = match_idx
+            lo = max(0, match_idx - context_before)
+            hi = min(n_lines, match_idx + context_after + 1)
+            keep[lo:hi] = b"\x01" * (hi - lo)
+
+        # Emit each contiguous run of kept lines, separated by "---"
+        runs: List[str] = []
+        start = keep.find(1)
+        while start != -1:
+            end = keep.find(0, start)
+            if end == -1:
+                end = n_lines
+            runs.append("\n".join(lines[start:end]))
+            start = keep.find(1, end)
+
+        return "\n---\n".join(runs), actual_match_count
+
+    @staticmethod
+    def _matching_line_indices(
+        text: str,
+        lines: List[str],
+        regex: re.Pattern,
+        limit: Optional[int],
+    ) -> List[int]:
+        """Return the sorted indices of *lines* that *regex* matches (at most *limit*).
+
+        Searching *text* as a whole (with ``re.MULTILINE`` so ``^``/``$``
+        still anchor per line) lets the regex engine skip non-matching lines
+        in C instead of calling ``search`` once per line.  After each hit the
+        scan resumes at the next line, and once hits are dense the remainder
+        is scanned per line.  Patterns whose meaning depends on the line being
+        the whole subject (see ``_LINE_SENSITIVE_RE``), or a hit spanning a
+        newline, use the per-line scan so results are unchanged.  Plain
+        literal patterns (``lit`` or ``lit1|lit2``) skip the regex engine,
+        see ``_literal_line_indices``.
+        """
+        needles = _literal_alternatives(regex)
+        if needles is not None and not any("\n" in needle for needle in needles):
+            if len(needles) == 1:
+                return GrepProcessor._literal_line_indices(text, lines, needles[0], limit)
+            # Each literal's first *limit* lines cover the union's first *limit*
+            hits: set = set()
+            for needle in needles:
+                hits.update(GrepProcessor._literal_line_indices(text, lines, needle, limit))
+            found = sorted(hits)
+            return found[:limit] if limit else found
+
+        found = []
+        resume = 0  # first line still to be scanned per line
+
+        # A leading ``^`` already fails fast per line, so only sweep otherwise
+        source = regex.pattern
+        if not source.startswith("^") and not _LINE_SENSITIVE_RE.search(source):
+            sweep = _compile_pattern(source, regex.flags | re.MULTILINE)
+            idx = 0
+            pos = 0
+            while True:
+                m = sweep.search(text, pos)
+                if m is None:
+                    return found
+                start, end = m.span()
+                if "\n" in m.group():
+                    # Hit spans lines: redo everything per line
+                    found = []
+                    break
+                # Advance the line index by the newlines since the last hit
+                idx += text.count("\n", pos, start)
+                found.append(idx)
+                if limit and len(found) >= limit:
+                    return found
+                # One hit is enough for this line; resume at the next one
+                pos = text.find("\n", end) + 1
+                if not pos:
+                    return found
+                idx += 1
+                if len(found) >= _DENSE_HITS and len(found) * 4 > idx:
+                    # Over a quarter of lines match: per-line is cheaper
+                    resume = idx
+                    break
 
-            for i in range(match_idx + 1, min(len(lines), match_idx + 1 + context_after)):
-                if i not in included_indices:
-                    result_lines.append(lines[i])
-                    included_indices.add(i)
+        for i in range(resume, len(lines)):
+            if regex.search(lines[i]):
+                found.append(i)
+                if limit and len(found) >= limit:
+                    break
+        return found
 
-            if context_before > 0 or context_after > 0:
-                next_match = min(
-                    (m for m in matched_line_indices if m > match_idx), default=None
-                )
-                if next_match and next_match > match_idx + context_after + 1:
-                    result_lines.append("---")
+    @staticmethod
+    def _literal_line_indices(
+        text: str,
+        lines: List[str],
+        needle: str,
+        limit: Optional[int],
+    ) -> List[int]:
+        """``_matching_line_indices`` for one newline-free literal *needle*.
+
+        Same sweep, with ``str.find`` over the whole text while hits are
+        sparse and ``in`` per line once they are dense.
+        """
+        found: List[int] = []
+        idx = 0
+        pos = 0
+        while True:
+            start = text.find(needle, pos)
+            if start < 0:
+                return found
+            idx += text.count("\n", pos, start)
+            found.append(idx)
+            if limit and len(found) >= limit:
+                return found
+            pos = text.find("\n", start + len(needle)) + 1
+            if not pos:
+                return found
+            idx += 1
+            if len(found) >= _DENSE_HITS and len(found) * 4 > idx:
+                break
 
-        return "\n".join(result_lines), actual_match_count
+        for i in range(idx, len(lines)):
+            if needle in lines[i]:
+                found.append(i)
+                if limit and len(found) >= limit:
+                    break
+        return found
 
     @staticmethod
     def _search_in_structure(
@@ -1077,47 +1216,73 @@ class GrepProcessor(BaseProcessor):
         max_matches: Optional[int],
         current_count: int,
     ) -> Any:
-        if max_matches and current_count >= max_matches:
-            return None
-
-        if isinstance(data, dict):
-            matches: Dict[str, Any] = {}
-            count = current_count
-            for key, value in data.items():
-                if max_matches and count >= max_matches:
-                    break
-                key_matches = regex.search(str(key))
-                value_matches = isinstance(value, str) and regex.search(value)
-
-                if key_matches or value_matches:
-                    matches[key] = value
-                    count += 1
-                elif isinstance(value, (dict, list)):
-                    nested = GrepProcessor._search_in_structure(value, regex, max_matches, count)
-                    if nested is not None and nested != {} and nested != []:
-                        matches[key] = nested
+        # Tests leaf strings in place (no per-node serialisation); the bound
+        # ``search`` and limit are captured once by the recursive closure.
+        search = regex.search
+
+        def walk(node: Any, count: int) -> Any:
+            if max_matches and count >= max_matches:
+                return None
+
+            if isinstance(node, dict):
+                matches: Dict[str, Any] = {}
+                for key, value in node.items():
+                    if max_matches and count >= max_matches:
+                        break
+                    if search(str(key)) or (isinstance(value, str) and search(value)):
+                        matches[key] = value
                         count += 1
-            return matches if matches else None
-
-        elif isinstance(data, list):
-            list_matches: List[Any] = []
-            count = current_count
-            for item in data:
-                if max_matches and count >= max_matches:
-                    break
-                if isinstance(item, (dict, list)):
-                    nested = GrepProcessor._search_in_structure(item, regex, max_matches, count)
-                    if nested is not None and nested != {} and nested != []:
-                        list_matches.append(nested)
+                    elif isinstance(value, (dict, list)):
+                        nested = walk(value, count)
+                        if nested:
+                            matches[key] = nested
+                            count += 1
+                return matches or None
+
+            if isinstance(node, list):
+                list_matches: List[Any] = []
+                for item in node:
+                    if max_matches and count >= max_matches:
+                        break
+                    if isinstance(item, (dict, list)):
+                        nested = walk(item, count)
+                        if nested:
+                            list_matches.append(nested)
+                            count += 1
+                    elif isinstance(item, str) and search(item):
+                        list_matches.append(item)
                         count += 1
-                elif isinstance(item, str) and regex.search(item):
-                    list_matches.append(item)
-                    count += 1
-            return list_matches if list_matches else None
-        else:
-            if regex.search(str(data)):
-                return data
-            return None
+                return list_matches or None
+
+            return node if search(str(node)) else None
+
+        return walk(data, current_count)
+
+    @staticmethod
+    def _grep_structured(
+        item: TextContent,
+        regex: re.Pattern,
+        max_matches: Optional[int],
+        current_count: int,
+    ) -> Tuple[Any, Optional[str]]:
+        """Search *item*'s JSON; return ``(matches, rendered)`` or ``(None, None)``.
+
+        Raises ``json.JSONDecodeError`` when the text is not JSON.
+        """
+        matches = GrepProcessor._search_in_structure(
+            _load_json(item), regex, max_matches, current_count
+        )
+        if matches is None or matches == {} or matches == []:
+            return None, None
+        return matches, json.dumps(matches, indent=2)
+
+    @staticmethod
+    def _structure_match_total(matches: Any) -> int:
+        if isinstance(matches, list):
+            return len(matches)
+        if isinstance(matches, dict):
+            return GrepProcessor._count_dict_matches(matches)
+        return 1
 
     @staticmethod
     def _count_dict_matches(matches: Dict[str, Any]) -> int:
@@ -1140,6 +1305,9 @@ class ProcessorPipeline:
     """Composes multiple ``BaseProcessor`` instances into a sequential pipeline.
 
     Each processor is invoked only if a matching key exists in *specs*.
+    A stage sees the previous stage's text exactly: a line grep after a
+    projection that removed nothing runs over the original (possibly
+    single-line) JSON, not an indented re-encoding of it.
     """
 
     def __init__(self, processors: Optional[List[BaseProcessor]] = None) -> None:
@@ -1153,8 +1321,18 @@ class ProcessorPipeline:
         self, content: List[Content], specs: Dict[str, Dict[str, Any]]
     ) -> ProcessorResult:
         """Run the pipeline synchronously, returning a merged ``ProcessorResult``."""
-        current_content = content
         original_size = _measure_content(content)
+        if not specs:
+            # Nothing to run: pass the content through untouched
+            return ProcessorResult(
+                content=content,
+                original_size=original_size,
+                filtered_size=original_size,
+            )
+
+        current_content = content
+        # Each stage measures its own output; the last one's is the total
+        filtered_size = original_size
         total_metadata: Dict[str, Any] = {}
 
         for processor in self.processors:
@@ -1163,9 +1341,9 @@ class ProcessorPipeline:
                 continue
             proc_result = processor.process(current_content, specs[key])
             current_content = proc_result.content
+            filtered_size = proc_result.filtered_size
             total_metadata[key] = proc_result.metadata
 
-        filtered_size = _measure_content(current_content)
         return ProcessorResult(
             content=current_content,
             original_size=original_size,
@@ -1177,8 +1355,18 @@ class ProcessorPipeline:
         self, content: List[Content], specs: Dict[str, Dict[str, Any]]
     ) -> ProcessorResult:
         """Run the pipeline asynchronously, returning a merged ``ProcessorResult``."""
-        current_content = content
         original_size = _measure_content(content)
+        if not specs:
+            # Nothing to run: pass the content through untouched
+            return ProcessorResult(
+                content=content,
+                original_size=original_size,
+                filtered_size=original_size,
+            )
+
+        current_content = content
+        # Each stage measures its own output; the last one's is the total
+        filtered_size = original_size
         total_metadata: Dict[str, Any] = {}
 
         for processor in self.processors:
@@ -1193,9 +1381,9 @@ class ProcessorPipeline:
                 proc_result = processor.process(current_content, specs[key])
             
             current_content = proc_result.content
+            filtered_size = proc_result.filtered_size
             total_metadata[key] = proc_result.metadata
 
-        filtered_size = _measure_content(current_content)
         return ProcessorResult(
             content=current_content,
             original_size=original_size,
@@ -1208,6 +1396,128 @@ class ProcessorPipeline:
 # Module-level helpers
 # ---------------------------------------------------------------------------
 
+def _text_content(text: str) -> TextContent:
+    """Build a TextContent for proxy-generated text, skipping pydantic validation.
+
+    Only for messages the proxy assembles itself, where ``type`` and ``text``
+    are known to be valid.
+    """
+    return TextContent.model_construct(type="text", text=text)
+
+
+@lru_cache(maxsize=None)
+def _message_content(text: str) -> TextContent:
+    """Shared ``_text_content`` for the fixed status/error messages.
+
+    Only for constant strings; the returned item is shared between
+    responses and must not be mutated.
+    """
+    return _text_content(text)
+
+
+def _remember_parsed(item: TextContent, data: Any) -> TextContent:
+    """Record *data* as the decoded JSON of *item* (a processor's own output).
+
+    A later pipeline stage reading *item* then skips re-parsing the text we
+    just serialised.  The entry is dropped when *item* is garbage collected,
+    so ids are never confused after reuse.  *data* must not be mutated.
+    """
+    key = id(item)
+    _PARSED_JSON[key] = data
+    weakref.finalize(item, _PARSED_JSON.pop, key, None)
+    return item
+
+
+def _load_json(item: TextContent) -> Any:
+    """``json.loads(item.text)``, reusing the decode recorded by ``_remember_parsed``."""
+    data = _PARSED_JSON.get(id(item), _NOT_PARSED)
+    return json.loads(item.text) if data is _NOT_PARSED else data
+
+
 def _measure_content(content: List[Content]) -> int:
     """Return total character count across all TextContent items."""
     return sum(len(item.text) for item in content if isinstance(item, TextContent))
+
+
+@lru_cache(maxsize=512)
+def _literal_alternatives(regex: re.Pattern) -> Optional[Tuple[str, ...]]:
+    """Return the literals of a case-sensitive ``lit1|lit2|...`` pattern, else ``None``.
+
+    Covers a single plain literal too.  Each literal can be pre-checked
+    with ``in`` (a C substring scan) before running the regex engine.
+    ``IGNORECASE``/``VERBOSE`` patterns are left to the engine since ``str``
+    matching would not mirror their semantics.
+    """
+    if regex.flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+    alternatives = tuple(regex.pattern.split("|"))
+    if any(_REGEX_META_RE.search(alt) for alt in alternatives):
+        return None
+    return alternatives
+
+
+@lru_cache(maxsize=256)
+def _compile_include_fields(
+    fields: Tuple[str, ...],
+) -> Tuple[Tuple[Tuple[str, Optional[Tuple[str, ...]], Optional[str]], ...], bool]:
+    """Pre-split include *fields* into ``(field, parts, rest)`` entries.
+
+    *parts* is the dot-split path and *rest* everything after the first
+    segment; both are ``None`` for a plain key.  Projection specs repeat
+    for every dict (and every array item) they are applied to, so the
+    splitting is done once per distinct field list.  The second element
+    is ``True`` when no field is dotted.
+    """
+    compiled = []
+    for fld in fields:
+        if "." in fld:
+            # Interned once here; every walk of the spec reuses them
+            parts = tuple(map(sys.intern, fld.split(".")))
+            compiled.append((fld, parts, fld[len(parts[0]) + 1:]))
+        else:
+            compiled.append((fld, None, None))
+    return tuple(compiled), all(parts is None for _, parts, _ in compiled)
+
+
+@lru_cache(maxsize=256)
+def _compile_exclude_fields(
+    fields: Tuple[str, ...],
+) -> Tuple[frozenset, Dict[str, Tuple[str, ...]]]:
+    """Index exclude *fields* as ``(excluded_keys, nested_by_key)``.
+
+    ``nested_by_key`` maps every dotted prefix of a field to the remaining
+    sub-paths to exclude beneath it (in field order), replacing a scan of
+    all fields for each key.  Callers must not mutate the result.
+    """
+    nested: Dict[str, List[str]] = {}
+    for fld in fields:
+        start = 0
+        while True:
+            dot = fld.find(".", start)
+            if dot == -1:
+                break
+            nested.setdefault(fld[:dot], []).append(fld[dot + 1:])
+            start = dot + 1
+    return frozenset(fields), {key: tuple(rest) for key, rest in nested.items()}
+
+
+def _compile_pattern(pattern: str, flags: int) -> re.Pattern:
+    """Compile *pattern* once per ``(pattern, flags)`` pair.
+
+    Agents tend to repeat the same grep across calls, so the parsed pattern
+    is memoised rather than re-parsed each time.  Invalid patterns are
+    memoised too and raise an equivalent ``re.error``.
+    """
+    compiled = _compile_or_error(pattern, flags)
+    if isinstance(compiled, re.error):
+        # Fresh instance, so the cached one doesn't accumulate tracebacks
+        raise re.error(compiled.msg, compiled.pattern, compiled.pos)
+    return compiled
+
+
+@lru_cache(maxsize=512)
+def _compile_or_error(pattern: str, flags: int) -> re.Pattern | re.error:
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        return e
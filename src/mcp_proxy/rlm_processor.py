@@ -216,6 +216,20 @@ class RecursiveContextManager:
         }
 
 
+def compute_exploration_metadata(
+    texts: List[str],
+    cache_id: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Picklable entry point for running ``create_exploration_metadata`` in a
+    worker process.
+
+    Takes plain strings rather than Content objects to keep pickling cheap.
+    """
+    content: List[Content] = [TextContent(type="text", text=t) for t in texts]
+    return RecursiveContextManager().create_exploration_metadata(content, cache_id=cache_id)
+
+
 class ChunkProcessor:
     """
     Process large outputs in chunks for efficient context management.
@@ -10,29 +10,43 @@ recursive exploration of tool outputs.
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import itertools
 import json
 import logging
+import math
+import secrets
 import sys
-from typing import Any, Dict, List, Optional, Union
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 
+import anyio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
-from mcp.types import Content, TextContent, Tool, ServerCapabilities
-
-from mcp_proxy.cache import AgentAwareCacheManager, SmartCacheManager, AsyncCacheManager
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, Content, TextContent, Tool, ServerCapabilities
+
+from mcp_proxy.cache import (
+    AgentAwareCacheManager,
+    AsyncCacheManager,
+    SmartCacheManager,
+    TTLMapping,
+)
 from mcp_proxy.config import ProxySettings
 from mcp_proxy.executor_manager import ExecutorManager
 from mcp_proxy.logging_config import get_logger
-from mcp_proxy.rlm_processor import RecursiveContextManager
+from mcp_proxy.rlm_processor import RecursiveContextManager, compute_exploration_metadata
 from mcp_proxy.processors import (
     GrepProcessor,
     ProcessorPipeline,
     ProcessorResult,
     ProjectionProcessor,
     _measure_content,
+    _text_content,
 )
 
 logger = get_logger(__name__)
@@ -124,10 +138,58 @@ _SERVER_INSTRUCTIONS = (
     "  - proxy_filter: project/filter specific fields from cached or fresh results\n"
     "  - proxy_search: grep/bm25/fuzzy/context search on cached or fresh results\n"
     "  - proxy_explore: discover data structure (keys, types, sizes) without loading content\n"
+    "Slow tools can be started with proxy_background_call, which returns a handle "
+    "immediately; collect the result later with proxy_get_result.\n"
     "All proxy tool parameters are flat top-level strings/arrays/integers — no nested objects required."
 )
 
 
+_TRUNCATION_HINT = (
+    "\n\n--- Response truncated ({size:,} chars). "
+    'Full result cached as cache_id="{cache_id}". '
+    "Use proxy_filter, proxy_search, or proxy_explore with this cache_id "
+    "to drill into the data. ---"
+)
+
+# RLM hints are read by agents, not humans: compact JSON skips the slow
+# indent path in the stdlib encoder.
+_COMPACT_JSON = (",", ":")
+
+# Above this many characters, RLM hint generation runs in a worker process
+# (below it, pickling overhead outweighs the GIL-free traversal).
+_PROCESS_OFFLOAD_THRESHOLD = 32 * 1024
+
+# Session identifier for the request being handled; set once per tool call
+# so every _get_agent_id() lookup inside it is a plain ContextVar read.
+_current_session: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "mcp_proxy_current_session", default=None
+)
+
+# Idle time after which a session → agent ID mapping is forgotten.
+_SESSION_TTL_SECONDS = 3600
+
+# Upper bound on outstanding proxy_background_call handles.
+_MAX_BACKGROUND_TASKS = 100
+
+# Longest proxy_get_result wait, in seconds.
+_MAX_GET_RESULT_TIMEOUT = 300.0
+
+# Raised by a ClientSession whose server process or stdio pipes are gone
+_CLOSED_STREAM_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
+
+def _is_connection_lost(exc: BaseException) -> bool:
+    """Return True if *exc* means the session's transport died (not a tool error)."""
+    if isinstance(exc, McpError):
+        return exc.error.code == CONNECTION_CLOSED
+    return isinstance(exc, _CLOSED_STREAM_ERRORS)
+
+
 class MCPProxyServer:
     """MCP Proxy Server that intermediates between clients and underlying servers."""
 
@@ -142,7 +204,14 @@ class MCPProxyServer:
 
         self.underlying_servers: Dict[str, ClientSession] = {}
         self.server_configs = underlying_servers or []
+        # Index over underlying_servers for _resolve_tool_name; rebuilt via
+        # _rebuild_server_index() whenever a server connects or disconnects.
+        self._single_segment_servers: frozenset[str] = frozenset()
+        self._multi_segment_servers: tuple[str, ...] = ()
         self.tools_cache: Dict[str, List[Tool]] = {}
+        # Fully built tools/list response; reset whenever a server (re)connects
+        self._cached_list_tools: Optional[List[Tool]] = None
+        self._list_tools_lock = asyncio.Lock()
 
         # Executor for CPU-bound work
         self.executor_manager = ExecutorManager()
@@ -175,11 +244,32 @@ class MCPProxyServer:
         # Connection bookkeeping
         self._server_contexts: Dict[str, Any] = {}
         self._connection_tasks: Dict[str, asyncio.Task] = {}
+        # proxy_background_call handle -> (owning agent ID, task)
+        self._background_tasks: Dict[str, Tuple[Optional[str], asyncio.Task]] = {}
+
+        # Set by cleanup(); each connection task then closes its own session,
+        # since anyio requires a context to exit in the task that entered it
+        self._shutdown_event = asyncio.Event()
+        # All live sessions per server (primary first), used round-robin
+        self._session_pools: Dict[str, Deque[ClientSession]] = {}
+        # Pool slot of each live session (0 = primary), and what is needed to
+        # reopen a slot whose session lost its connection
+        self._session_slots: Dict[ClientSession, int] = {}
+        self._server_params: Dict[str, StdioServerParameters] = {}
+        self._reconnect_tasks: Dict[str, asyncio.Task] = {}
         
-        # Agent/session tracking for cache isolation
-        self._session_to_agent: Dict[str, str] = {}
-        self._agent_counter = 0
-        self._agent_lock = asyncio.Lock()
+        # Agent/session tracking for cache isolation (bounded so stale
+        # sessions don't accumulate in long-running proxies)
+        self._session_to_agent = TTLMapping(
+            maxsize=self.settings.max_total_agents * 4,
+            ttl_seconds=_SESSION_TTL_SECONDS,
+        )
+        # next() on itertools.count is atomic under the GIL, so no lock needed
+        self._agent_counter = itertools.count(1)
+        # Client session object -> stable ID; weak so a closed session's entry
+        # goes with it and its id() can never be mistaken for a new session
+        self._session_ids: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+        self._session_counter = itertools.count(1)
 
         # Metrics
         self.metrics = ConnectionPoolMetrics()
@@ -198,80 +288,27 @@ class MCPProxyServer:
         @self.server.list_tools()
         async def list_tools() -> List[Tool]:
             """Aggregate tools from all underlying servers plus proxy tools."""
-            all_tools: List[Tool] = []
-
-            logger.debug("list_tools called")
-            logger.debug("underlying_servers keys: %s", list(self.underlying_servers.keys()))
-            logger.debug("tools_cache keys: %s", list(self.tools_cache.keys()))
-
-            # ── 1. Register first-class proxy tools ───────────────────
-            all_tools.extend(self._build_proxy_tools())
-
-            # ── 2. Cached tools (clean pass-through) ──────────────────
-            for server_name, cached_tools in self.tools_cache.items():
-                logger.debug("Using %d cached tools from %s", len(cached_tools), server_name)
-                for tool in cached_tools:
-                    all_tools.append(
-                        Tool(
-                        name=f"{server_name}_{tool.name}",
-                            description=(tool.description or "") + f"\n(via {server_name})",
-                            inputSchema=self._clean_schema(tool.inputSchema),
-                    )
-                    )
-
-            # ── 3. Fetch from servers with cache misses ───────────────
-            servers_to_fetch = [
-                (sn, sess)
-                for sn, sess in self.underlying_servers.items()
-                if sn not in self.tools_cache or not self.tools_cache.get(sn)
-            ]
-
-            if servers_to_fetch:
-                logger.debug("Fetching tools from %d server(s) in parallel", len(servers_to_fetch))
-
-                async def _fetch(sn: str, sess: ClientSession) -> tuple[str, List[Tool]]:
-                    try:
-                        result = await asyncio.wait_for(sess.list_tools(), timeout=10.0)
-                        return sn, result.tools
-                    except asyncio.TimeoutError:
-                        logger.error("Timeout fetching tools from %s", sn)
-                        return sn, []
-                    except Exception as exc:
-                        logger.error("Error listing tools from %s: %s", sn, exc, exc_info=True)
-                        return sn, []
-
-                results = await asyncio.gather(
-                    *(_fetch(sn, sess) for sn, sess in servers_to_fetch),
-                    return_exceptions=True,
-                )
-
-                for res in results:
-                    if isinstance(res, Exception):
-                        logger.error("Exception during parallel tool fetch: %s", res, exc_info=True)
-                        continue
-                    server_name, tools = res
-                    if tools:
-                        self.tools_cache[server_name] = tools
-                        logger.info("Loaded %d tools from %s", len(tools), server_name)
-                        for tool in tools:
-                            all_tools.append(
-                                Tool(
-                                name=f"{server_name}_{tool.name}",
-                                    description=(tool.description or "") + f"\n(via {server_name})",
-                                    inputSchema=self._clean_schema(tool.inputSchema),
-                            )
-                            )
-                    else:
-                        logger.warning("%s returned 0 tools", server_name)
-
-            logger.debug("Returning %d total tools", len(all_tools))
-            return all_tools
+            cached = self._cached_list_tools
+            if cached is not None:
+                return cached
+
+            async with self._list_tools_lock:
+                if self._cached_list_tools is not None:
+                    return self._cached_list_tools
+                all_tools = await self._aggregate_tools()
+                # Only memoize once every connected server contributed tools;
+                # otherwise the next call should retry the missing ones.
+                if all(self.tools_cache.get(sn) for sn in self.underlying_servers):
+                    self._cached_list_tools = all_tools
+                return all_tools
 
         # ── call_tool ─────────────────────────────────────────────────
         @self.server.call_tool()
         async def call_tool(name: str, arguments: dict) -> List[Content]:
             """Intercept tool calls, forward to underlying servers, and apply transformations."""
             logger.debug("call_tool called: %s", name)
+            if self.settings.enable_agent_isolation:
+                _current_session.set(self._request_session_id())
 
             # ── Proxy tools ───────────────────────────────────────────
             if name == "proxy_filter":
@@ -280,135 +317,212 @@ class MCPProxyServer:
                 return await self._handle_proxy_search(arguments)
             if name == "proxy_explore":
                 return await self._handle_proxy_explore(arguments)
+            if name == "proxy_background_call":
+                return await self._handle_proxy_background_call(arguments)
+            if name == "proxy_get_result":
+                return await self._handle_proxy_get_result(arguments)
+
+            # ── Underlying tools ──────────────────────────────────────
+            return await self._forward_tool_call(name, arguments)
+
+    # ------------------------------------------------------------------
+    # Tool forwarding
+    # ------------------------------------------------------------------
 
-            # ── Validate arguments ────────────────────────────────────
-            if not isinstance(arguments, dict):
-                raise ValueError(f"Arguments must be a dictionary, got: {type(arguments)}")
+    async def _forward_tool_call(self, name: str, arguments: Dict[str, Any]) -> List[Content]:
+        """Call an underlying tool and apply auto-truncation, caching and RLM hints."""
+        # ── Validate arguments ────────────────────────────────────
+        if not isinstance(arguments, dict):
+            raise ValueError(f"Arguments must be a dictionary, got: {type(arguments)}")
 
-            # ── Resolve server + tool ─────────────────────────────────
-            server_name, tool_name = self._resolve_tool_name(name)
+        # ── Resolve server + tool ─────────────────────────────────
+        server_name, tool_name = self._resolve_tool_name(name)
 
-            session = self.underlying_servers[server_name]
-            logger.debug("Parsed: server=%s, tool=%s", server_name, tool_name)
+        session = self._acquire_session(server_name)
+        logger.debug("Parsed: server=%s, tool=%s", server_name, tool_name)
 
-            # ── Call underlying tool ──────────────────────────────────
+        # ── Call underlying tool ──────────────────────────────────
+        try:
+            logger.debug("Calling tool %s on %s with timeout 60s", tool_name, server_name)
+            result = await asyncio.wait_for(session.call_tool(tool_name, arguments), timeout=60.0)
+            logger.debug("Tool call completed successfully")
+        except asyncio.TimeoutError:
+            msg = f"Timeout calling tool {tool_name} on {server_name} (60s)"
+            logger.error(msg)
+            return [TextContent(type="text", text=f"Error: {msg}")]
+        except Exception as exc:
+            if _is_connection_lost(exc):
+                self._evict_session(server_name, session)
+            msg = f"Error calling tool {tool_name} on {server_name}: {exc}"
+            logger.error(msg, exc_info=True)
+            return [TextContent(type="text", text=f"Error: {msg}")]
+
+        # No copy: the result object is ours and the auto-truncation path
+        # replaces ``content`` with a fresh list before anything is mutated
+        # in a way that would affect the cache.
+        content: List[Content] = getattr(result, "content", None) or []
+        original_size = _measure_content(content)
+
+        # ── Auto-truncation + caching ─────────────────────────────
+        new_size = _measure_content(content)
+        auto_truncated = False
+        exploration_metadata: Optional[Dict[str, Any]] = None
+
+        if (
+            self.settings.enable_auto_truncation
+            and new_size > self.settings.max_response_size
+        ):
+            # Use agent_id if available
+            agent_id = await self._get_agent_id()
+            cache_id = await self.cache.put(content, name, arguments, agent_id=agent_id)
+
+            # Generate RLM exploration hints based on the full content
             try:
-                logger.debug("Calling tool %s on %s with timeout 60s", tool_name, server_name)
-                result = await asyncio.wait_for(session.call_tool(tool_name, arguments), timeout=60.0)
-                logger.debug("Tool call completed successfully")
-            except asyncio.TimeoutError:
-                msg = f"Timeout calling tool {tool_name} on {server_name} (60s)"
-                logger.error(msg)
-                return [TextContent(type="text", text=f"Error: {msg}")]
+                exploration_metadata = await self._create_exploration_metadata(
+                    content,
+                    cache_id=cache_id,
+                )
             except Exception as exc:
-                msg = f"Error calling tool {tool_name} on {server_name}: {exc}"
-                logger.error(msg, exc_info=True)
-                return [TextContent(type="text", text=f"Error: {msg}")]
+                logger.debug("Failed to generate RLM exploration metadata: %s", exc, exc_info=True)
+
+            truncated_text = self._truncate_content(content, self.settings.max_response_size)
+            hint = _TRUNCATION_HINT.format(size=new_size, cache_id=cache_id)
 
-            content: List[Content] = list(result.content) if hasattr(result, "content") else []
-            original_size = _measure_content(content)
+            # If we have RLM hints, surface a concise textual summary for agents
+            if rlm_hints := (exploration_metadata or {}).get("rlm_hints"):
+                steps = (rlm_hints.get("next_steps") or [])[:3]
+                hint += "\n\n--- RLM exploration suggestions ---" + "".join(
+                    f"\n{idx}. Call {step.get('tool') or 'tool'} when: {step.get('when') or ''}"
+                    for idx, step in enumerate(steps, start=1)
+                )
+                if extra_hint := rlm_hints.get("hint"):
+                    hint += "\n\n" + extra_hint
 
-            # ── Auto-truncation + caching ─────────────────────────────
+            content = [_text_content(truncated_text + hint)]
+            auto_truncated = True
             new_size = _measure_content(content)
-            auto_truncated = False
-            exploration_metadata: Optional[Dict[str, Any]] = None
-
-            if (
-                self.settings.enable_auto_truncation
-                and new_size > self.settings.max_response_size
-            ):
-                # Use agent_id if available
-                agent_id = await self._get_agent_id()
-                cache_id = await self.cache.put(content, name, arguments, agent_id=agent_id)
-
-                # Generate RLM exploration hints based on the full content
-                try:
-                    exploration_metadata = self.recursive_context_manager.create_exploration_metadata(
-                        content,
-                        cache_id=cache_id,
-                    )
-                except Exception as exc:
-                    logger.debug("Failed to generate RLM exploration metadata: %s", exc, exc_info=True)
-
-                truncated_text = self._truncate_content(content, self.settings.max_response_size)
-                hint_lines = [
-                    f"--- Response truncated ({new_size:,} chars). "
-                    f"Full result cached as cache_id=\"{cache_id}\". "
-                    "Use proxy_filter, proxy_search, or proxy_explore with this cache_id "
-                    "to drill into the data. ---"
-                ]
-
-                # If we have RLM hints, surface a concise textual summary for agents
-                if exploration_metadata and exploration_metadata.get("rlm_hints"):
-                    rlm_hints = exploration_metadata["rlm_hints"]
-                    steps = rlm_hints.get("next_steps") or []
-                    hint_lines.append("")
-                    hint_lines.append("--- RLM exploration suggestions ---")
-                    for idx, step in enumerate(steps[:3], start=1):
-                        tool = step.get("tool") or "tool"
-                        when = step.get("when") or ""
-                        hint_lines.append(f"{idx}. Call {tool} when: {when}")
-                    extra_hint = rlm_hints.get("hint")
-                    if extra_hint:
-                        hint_lines.append("")
-                        hint_lines.append(extra_hint)
-
-                hint = "\n\n" + "\n".join(hint_lines)
-                content = [TextContent(type="text", text=truncated_text + hint)]
-                auto_truncated = True
-                new_size = _measure_content(content)
-
-            # ── Optional RLM hints for non-truncated responses ────────
-            if not auto_truncated:
-                try:
-                    exploration_metadata = self.recursive_context_manager.create_exploration_metadata(
-                        content,
-                    )
-                except Exception as exc:
-                    logger.debug("Failed to generate RLM exploration metadata: %s", exc, exc_info=True)
-
-            # ── Metrics ───────────────────────────────────────────────
-            # Legacy `_meta`-driven projection/grep support has been fully removed.
-            # `used_projection` and `used_grep` are now reserved for first-class
-            # proxy tools (see `_handle_proxy_filter` and `_handle_proxy_search`).
-            used_projection = False
-            used_grep = False
-            self.metrics.record_call(
-                original_size, new_size, used_projection, used_grep, auto_truncated
+
+        # ── Optional RLM hints for non-truncated responses ────────
+        if not auto_truncated:
+            try:
+                exploration_metadata = await self._create_exploration_metadata(
+                    content,
+                )
+            except Exception as exc:
+                logger.debug("Failed to generate RLM exploration metadata: %s", exc, exc_info=True)
+
+        # ── Metrics ───────────────────────────────────────────────
+        # Legacy `_meta`-driven projection/grep support has been fully removed.
+        # `used_projection` and `used_grep` are now reserved for first-class
+        # proxy tools (see `_handle_proxy_filter` and `_handle_proxy_search`).
+        used_projection = False
+        used_grep = False
+        self.metrics.record_call(
+            original_size, new_size, used_projection, used_grep, auto_truncated
+        )
+
+        if original_size > 0:
+            savings = ((original_size - new_size) / original_size) * 100
+            logger.info(
+                "Token savings: %d -> %d tokens (%.1f%% reduction)",
+                original_size,
+                new_size,
+                savings,
             )
 
-            if original_size > 0:
-                savings = ((original_size - new_size) / original_size) * 100
-                logger.info(
-                    "Token savings: %d -> %d tokens (%.1f%% reduction)",
-                    original_size,
-                    new_size,
-                    savings,
+        # If we have exploration metadata, attach it as a lightweight JSON block
+        if exploration_metadata and exploration_metadata.get("rlm_hints"):
+            try:
+                meta_text = json.dumps(exploration_metadata, separators=_COMPACT_JSON)
+                # Append as a separate content item to keep original response intact
+                content.append(_text_content(f"\n\nRLM exploration metadata:\n{meta_text}"))
+            except Exception as exc:
+                logger.debug("Failed to attach RLM exploration metadata: %s", exc, exc_info=True)
+
+        return content
+
+    # ------------------------------------------------------------------
+    # Tool aggregation
+    # ------------------------------------------------------------------
+
+    async def _aggregate_tools(self) -> List[Tool]:
+        """Build the full tool list: proxy tools plus every underlying server's tools."""
+        all_tools: List[Tool] = []
+
+        logger.debug("list_tools called")
+        logger.debug("underlying_servers keys: %s", list(self.underlying_servers.keys()))
+        logger.debug("tools_cache keys: %s", list(self.tools_cache.keys()))
+
+        # ── 1. Register first-class proxy tools ───────────────────
+        all_tools.extend(self._build_proxy_tools())
+
+        # ── 2. Cached tools (clean pass-through) ──────────────────
+        for server_name, cached_tools in self.tools_cache.items():
+            logger.debug("Using %d cached tools from %s", len(cached_tools), server_name)
+            for tool in cached_tools:
+                all_tools.append(
+                    Tool(
+                    name=f"{server_name}_{tool.name}",
+                        description=(tool.description or "") + f"\n(via {server_name})",
+                        inputSchema=self._clean_schema(tool.inputSchema),
+                )
                 )
 
-            # If we have exploration metadata, attach it as a lightweight JSON block
-            if exploration_metadata and exploration_metadata.get("rlm_hints"):
+        # ── 3. Fetch from servers with cache misses ───────────────
+        servers_to_fetch = [
+            (sn, sess)
+            for sn, sess in self.underlying_servers.items()
+            if not self.tools_cache.get(sn)
+        ]
+
+        if servers_to_fetch:
+            logger.debug("Fetching tools from %d server(s) in parallel", len(servers_to_fetch))
+
+            async def _fetch(sn: str, sess: ClientSession) -> tuple[str, List[Tool]]:
                 try:
-                    meta_text = json.dumps(exploration_metadata, indent=2)
-                    # Append as a separate content item to keep original response intact
-                    content.append(
-                        TextContent(
-                            type="text",
-                            text=f"\n\nRLM exploration metadata:\n{meta_text}",
-                        )
-                    )
+                    result = await asyncio.wait_for(sess.list_tools(), timeout=10.0)
+                    return sn, result.tools
+                except asyncio.TimeoutError:
+                    logger.error("Timeout fetching tools from %s", sn)
+                    return sn, []
                 except Exception as exc:
-                    logger.debug("Failed to attach RLM exploration metadata: %s", exc, exc_info=True)
+                    logger.error("Error listing tools from %s: %s", sn, exc, exc_info=True)
+                    return sn, []
+
+            results = await asyncio.gather(
+                *(_fetch(sn, sess) for sn, sess in servers_to_fetch),
+                return_exceptions=True,
+            )
+
+            for res in results:
+                if isinstance(res, Exception):
+                    logger.error("Exception during parallel tool fetch: %s", res, exc_info=True)
+                    continue
+                server_name, tools = res
+                if tools:
+                    self.tools_cache[server_name] = tools
+                    logger.info("Loaded %d tools from %s", len(tools), server_name)
+                    for tool in tools:
+                        all_tools.append(
+                            Tool(
+                            name=f"{server_name}_{tool.name}",
+                                description=(tool.description or "") + f"\n(via {server_name})",
+                                inputSchema=self._clean_schema(tool.inputSchema),
+                        )
+                        )
+                else:
+                    logger.warning("%s returned 0 tools", server_name)
+
+        logger.debug("Returning %d total tools", len(all_tools))
+        return all_tools
 
-            return content
-    
     # ------------------------------------------------------------------
     # Proxy tool definitions
     # ------------------------------------------------------------------
 
     @staticmethod
     def _build_proxy_tools() -> List[Tool]:
-        """Return the three first-class proxy tools with flat, simple schemas."""
+        """Return the first-class proxy tools with flat, simple schemas."""
         return [
             Tool(
                 name="proxy_filter",
@@ -541,6 +655,49 @@ class MCPProxyServer:
                     },
                 },
             ),
+            Tool(
+                name="proxy_background_call",
+                description=(
+                    "Start a tool call in the background and return a handle immediately. "
+                    "Use this for slow tools so you can issue other calls meanwhile, then "
+                    "collect the result with proxy_get_result."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "tool": {
+                            "type": "string",
+                            "description": "Full tool name to call (e.g. filesystem_read_file).",
+                        },
+                        "arguments": {
+                            "type": "object",
+                            "description": "Arguments for the tool call.",
+                        },
+                    },
+                    "required": ["tool"],
+                },
+            ),
+            Tool(
+                name="proxy_get_result",
+                description=(
+                    "Get the result of a proxy_background_call. Waits up to 'timeout' seconds; "
+                    "if the call is still running, says so and the handle stays valid."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "handle": {
+                            "type": "string",
+                            "description": "Handle returned by proxy_background_call.",
+                        },
+                        "timeout": {
+                            "type": "number",
+                            "description": "Seconds to wait for the result (0-300). Default 30.",
+                        },
+                    },
+                    "required": ["handle"],
+                },
+            ),
         ]
 
     # ------------------------------------------------------------------
@@ -553,7 +710,6 @@ class MCPProxyServer:
         """Resolve content from cache_id or by calling a tool fresh."""
         cache_id = arguments.get("cache_id")
         tool = arguments.get("tool")
-        agent_id = await self._get_agent_id()
 
         if cache_id:
             cached = await self.cache.get(cache_id)
@@ -567,19 +723,25 @@ class MCPProxyServer:
         if tool:
             tool_args = arguments.get("arguments", {})
             server_name, tool_name = self._resolve_tool_name(tool)
-            session = self.underlying_servers[server_name]
+            session = self._acquire_session(server_name)
             try:
                 result = await asyncio.wait_for(
                     session.call_tool(tool_name, tool_args), timeout=60.0
                 )
-                content = list(result.content) if hasattr(result, "content") else []
-                # Cache the fresh result for potential follow-up
-                cid = await self.cache.put(content, tool, tool_args, agent_id=agent_id)
-                logger.debug("Fresh call cached as %s", cid)
+                # Aliases the result's list; processors never mutate their input.
+                content = getattr(result, "content", None) or []
+                # Cache the fresh result for potential follow-up, but only when
+                # it is big enough that re-fetching it would be costly.
+                if _measure_content(content) >= self.settings.max_response_size // 2:
+                    agent_id = await self._get_agent_id()
+                    cid = await self.cache.put(content, tool, tool_args, agent_id=agent_id)
+                    logger.debug("Fresh call cached as %s", cid)
                 return content
             except asyncio.TimeoutError:
                 raise ValueError(f"Timeout calling tool {tool} (60s)")
             except Exception as exc:
+                if _is_connection_lost(exc):
+                    self._evict_session(server_name, session)
                 raise ValueError(f"Error calling tool {tool}: {exc}")
 
         raise ValueError(
@@ -662,21 +824,18 @@ class MCPProxyServer:
         # Then, attempt to derive RLM-style structure hints for follow-up calls
         exploration_hints: Optional[Dict[str, Any]] = None
         try:
-            exploration_hints = self.recursive_context_manager.create_exploration_metadata(content)
+            exploration_hints = await self._create_exploration_metadata(content)
         except Exception as exc:
             logger.debug("Failed to generate RLM hints for proxy_explore: %s", exc, exc_info=True)
 
         # Attach guidance as an additional content item if available
         if exploration_hints and exploration_hints.get("rlm_hints"):
             try:
-                hints_text = json.dumps(exploration_hints, indent=2)
-                guidance = TextContent(
-                    type="text",
-                    text=(
-                        "\n\nRLM-guided next steps:\n"
-                        "You can now use proxy_filter or proxy_search with the suggested projections/grep patterns.\n"
-                        f"{hints_text}"
-                    ),
+                hints_text = json.dumps(exploration_hints, separators=_COMPACT_JSON)
+                guidance = _text_content(
+                    "\n\nRLM-guided next steps:\n"
+                    "You can now use proxy_filter or proxy_search with the suggested projections/grep patterns.\n"
+                    f"{hints_text}"
                 )
                 result.content.append(guidance)
             except Exception as exc:
@@ -684,50 +843,149 @@ class MCPProxyServer:
 
         return result.content
 
+    async def _handle_proxy_background_call(self, arguments: Dict[str, Any]) -> List[Content]:
+        """Handle proxy_background_call: start the call and return a handle."""
+        tool = arguments.get("tool")
+        if not tool:
+            return [TextContent(type="text", text="Error: 'tool' is required for proxy_background_call.")]
+        tool_args = arguments.get("arguments") or {}
+
+        if len(self._background_tasks) >= _MAX_BACKGROUND_TASKS:
+            # Make room by dropping results nobody collected
+            for handle, (_, task) in list(self._background_tasks.items()):
+                if task.done():
+                    # Retrieving the exception also stops asyncio logging it
+                    # as "never retrieved" once the task is garbage-collected
+                    if not task.cancelled() and (exc := task.exception()) is not None:
+                        logger.debug("Dropping failed background call %s: %s", handle, exc)
+                    del self._background_tasks[handle]
+            if len(self._background_tasks) >= _MAX_BACKGROUND_TASKS:
+                return [TextContent(
+                    type="text",
+                    text=(
+                        f"Error: {_MAX_BACKGROUND_TASKS} background calls are already running. "
+                        "Collect some with proxy_get_result first."
+                    ),
+                )]
+
+        # Validate the name now so a typo fails fast instead of at collection
+        self._resolve_tool_name(tool)
+
+        agent_id = await self._get_agent_id()
+        handle = secrets.token_hex(6)
+        # create_task copies the current context, so the call runs as this agent
+        task = asyncio.create_task(self._forward_tool_call(tool, tool_args))
+        self._background_tasks[handle] = (agent_id, task)
+        logger.debug("Started background call %s for %s", handle, tool)
+
+        return [TextContent(
+            type="text",
+            text=(
+                f'Started {tool} in the background as handle="{handle}". '
+                "Call proxy_get_result with this handle to collect the result."
+            ),
+        )]
+
+    async def _handle_proxy_get_result(self, arguments: Dict[str, Any]) -> List[Content]:
+        """Handle proxy_get_result: wait for (or report on) a background call."""
+        handle = arguments.get("handle")
+        entry = self._background_tasks.get(handle) if handle else None
+        # Handles are private to the agent that created them
+        if entry is None or entry[0] != await self._get_agent_id():
+            return [TextContent(
+                type="text",
+                text=f"Error: Background call '{handle}' not found or already collected.",
+            )]
+
+        _, task = entry
+        try:
+            timeout = float(arguments.get("timeout", 30))
+            if math.isnan(timeout):
+                raise ValueError(timeout)
+        except (TypeError, ValueError):
+            return [TextContent(type="text", text="Error: 'timeout' must be a number of seconds.")]
+        timeout = min(max(timeout, 0.0), _MAX_GET_RESULT_TIMEOUT)
+
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        if not done:
+            return [TextContent(
+                type="text",
+                text=f'Background call "{handle}" is still running. Call proxy_get_result again later.',
+            )]
+
+        self._background_tasks.pop(handle, None)
+        if task.cancelled():
+            return [TextContent(type="text", text=f"Error: Background call '{handle}' was cancelled.")]
+        exc = task.exception()
+        if exc is not None:
+            return [TextContent(type="text", text=f"Error: {exc}")]
+        return task.result()
+
     # ------------------------------------------------------------------
     # Schema helpers
     # ------------------------------------------------------------------
 
     @staticmethod
     def _clean_schema(input_schema: Union[Dict[str, Any], Any]) -> Dict[str, Any]:
-        """Return a clean dict copy of a tool schema (no mutations)."""
+        """Return a tool schema as a plain dict (never mutates the input).
+
+        A dict schema is returned as-is, not copied: callers must not mutate
+        it. No memo is needed, since ``_aggregate_tools`` only runs when the
+        memoized ``list_tools`` response is rebuilt.
+        """
         if hasattr(input_schema, "model_dump"):
             return input_schema.model_dump()
         if hasattr(input_schema, "dict"):
             return input_schema.dict()
         if isinstance(input_schema, dict):
-            return dict(input_schema)
+            # Only ever read (Tool() validation copies it), so share it as-is
+            return input_schema
         return dict(input_schema) if input_schema else {"type": "object", "properties": {}}
 
     # ------------------------------------------------------------------
     # Tool-name resolution
     # ------------------------------------------------------------------
 
+    def _rebuild_server_index(self) -> None:
+        """Recompute the server-prefix index used by ``_resolve_tool_name``."""
+        self._single_segment_servers = frozenset(
+            sn for sn in self.underlying_servers if "_" not in sn
+        )
+        # Longest first so "a_b" wins over "a" for a tool named "a_b_x"
+        self._multi_segment_servers = tuple(
+            sorted((sn for sn in self.underlying_servers if "_" in sn), key=len, reverse=True)
+        )
+
     def _resolve_tool_name(self, name: str) -> tuple[str, str]:
         """Parse ``{server}_{tool}`` and validate against known servers."""
-        if "_" not in name:
+        head, sep, rest = name.partition("_")
+        if not sep:
             raise ValueError(f"Tool name must be in format 'server_tool', got: {name}")
 
-        # Try known server prefixes first
-        for known_server in self.underlying_servers:
+        # Server names that themselves contain "_" (rare) need a prefix check
+        for known_server in self._multi_segment_servers:
             if name.startswith(known_server + "_"):
                 return known_server, name[len(known_server) + 1:]
 
-        # Fallback: rsplit
-        parts = name.rsplit("_", 1)
-        if len(parts) != 2:
-            raise ValueError(f"Tool name must be in format 'server_tool', got: {name}")
+        # Common case: single set lookup on the first segment
+        if head in self._single_segment_servers:
+            return head, rest
 
-        server_name, tool_name = parts
+        # Fallback: split on the last "_"
+        server_name, _, tool_name = name.rpartition("_")
         if server_name not in self.underlying_servers:
-            available = list(self.underlying_servers.keys())
-            raise ValueError(
-                f"Unknown server: '{server_name}'. Available: {', '.join(available) or 'none'}. "
-                f"Tool name format: {{server_name}}_{{tool_name}}. "
-                f"Call list_tools() to see all available tool names."
-            )
+            raise self._unknown_server_error(server_name)
         return server_name, tool_name
 
+    def _unknown_server_error(self, server_name: str) -> ValueError:
+        """Build the (error-path only) message listing the available servers."""
+        available = ", ".join(self.underlying_servers) or "none"
+        return ValueError(
+            f"Unknown server: '{server_name}'. Available: {available}. "
+            f"Tool name format: {{server_name}}_{{tool_name}}. "
+            f"Call list_tools() to see all available tool names."
+        )
+
     # ------------------------------------------------------------------
     # Agent ID management
     # ------------------------------------------------------------------
@@ -737,7 +995,9 @@ class MCPProxyServer:
         Get agent ID for current request context.
         
         Since MCP doesn't provide built-in agent identification, we use
-        a session-based approach. In a real deployment, this could be
+        a session-based approach: ``call_tool`` records the client session
+        in a ContextVar and each session maps to one agent ID. In a real
+        deployment, this could be
         enhanced to extract agent IDs from:
         - MCP request headers/metadata
         - Authentication tokens
@@ -749,35 +1009,47 @@ class MCPProxyServer:
         """
         if not self.settings.enable_agent_isolation:
             return None
-        
-        # For now, use a simple session-based approach
-        # In production, extract from actual request context
+
+        session_id = _current_session.get() or "default"
+
+        # Map session to agent ID (no await between check and set, so
+        # this is race-free on a single event loop)
+        agent_id = self._session_to_agent.get(session_id)
+        if agent_id is None:
+            agent_id = f"agent_{next(self._agent_counter)}"
+            self._session_to_agent[session_id] = agent_id
+            logger.debug("Assigned agent ID %s to session %s", agent_id, session_id)
+        return agent_id
+
+    def _request_session_id(self) -> str:
+        """Identify the client session of the in-flight MCP request."""
         try:
-            # Try to get current task/context identifier
-            # This is a simplified approach - in production you'd extract
-            # from actual MCP request metadata
-            current_task = asyncio.current_task()
-            if current_task:
-                task_name = current_task.get_name()
-                # Use task name as session identifier
-                session_id = task_name.split("-")[-1] if "-" in task_name else "default"
-            else:
-                session_id = "default"
-            
-            # Map session to agent ID
-            async with self._agent_lock:
-                if session_id not in self._session_to_agent:
-                    self._agent_counter += 1
-                    agent_id = f"agent_{self._agent_counter}"
-                    self._session_to_agent[session_id] = agent_id
-                    logger.debug("Assigned agent ID %s to session %s", agent_id, session_id)
-                else:
-                    agent_id = self._session_to_agent[session_id]
-            
-            return agent_id
-        except Exception:
-            # Fallback to default agent
+            session = self.server.request_context.session
+        except LookupError:
+            # Called outside a request (e.g. directly in tests)
             return "default"
+        session_id = self._session_ids.get(session)
+        if session_id is None:
+            session_id = f"session-{next(self._session_counter)}"
+            self._session_ids[session] = session_id
+        return session_id
+
+    # ------------------------------------------------------------------
+    # RLM hint helper
+    # ------------------------------------------------------------------
+
+    async def _create_exploration_metadata(
+        self, content: List[Content], cache_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Build RLM exploration hints, offloading large payloads to a process."""
+        if _measure_content(content) > _PROCESS_OFFLOAD_THRESHOLD:
+            texts = [item.text for item in content if isinstance(item, TextContent)]
+            return await self.executor_manager.run_in_process(
+                compute_exploration_metadata, texts, cache_id
+            )
+        return self.recursive_context_manager.create_exploration_metadata(
+            content, cache_id=cache_id
+        )
 
     # ------------------------------------------------------------------
     # Truncation helper
@@ -789,92 +1061,143 @@ class MCPProxyServer:
         parts: List[str] = []
         total = 0
         for item in content:
-            if isinstance(item, TextContent):
-                remaining = max_chars - total
-                if remaining <= 0:
-                    break
-                text = item.text[:remaining]
+            # Items are deserialized by the SDK, so they are exact TextContent
+            # instances; an identity compare is cheaper than isinstance().
+            if type(item) is not TextContent:
+                continue
+            text = item.text
+            n = len(text)
+            if total + n <= max_chars:
+                # Fits entirely: no slice copy needed
                 parts.append(text)
-                total += len(text)
+                total += n
+            else:
+                parts.append(text[: max_chars - total])
+                break
         return "".join(parts)
 
     # ------------------------------------------------------------------
-    # Connection management (unchanged from original)
+    # Connection management
     # ------------------------------------------------------------------
 
     async def _connect_to_server_sync(
         self, server_name: str, server_params: StdioServerParameters
     ) -> None:
-        """Connect to a server and keep connection alive via a background task."""
-        logger.debug("_connect_to_server_sync called for %s", server_name)
+        """Connect to a server and keep its pooled sessions alive.
+
+        Slot 0 is the primary session: it registers the server and pre-loads
+        its tools, so it must succeed. Extra slots (``session_pool_size`` > 1)
+        only add capacity; a failure there is logged and the pool shrinks.
+        Each slot is a separate server process, so server-side state is not
+        shared between the sessions ``_acquire_session`` rotates through.
+        A session whose call fails because its connection died is evicted
+        and its slot reopened in the background (see ``_evict_session``).
+        """
+        self._server_params[server_name] = server_params
+        await self._connect_session(server_name, server_params, slot=0)
+
+        extra = max(1, self.settings.session_pool_size) - 1
+        if extra:
+            results = await asyncio.gather(
+                *(
+                    self._connect_session(server_name, server_params, slot=slot)
+                    for slot in range(1, extra + 1)
+                ),
+                return_exceptions=True,
+            )
+            for res in results:
+                if isinstance(res, Exception):
+                    logger.warning("Extra pooled session for %s failed: %s", server_name, res)
+            logger.info(
+                "     Session pool for %s: %d session(s)",
+                server_name,
+                len(self._session_pools.get(server_name, ())),
+            )
+
+    async def _connect_session(
+        self, server_name: str, server_params: StdioServerParameters, slot: int
+    ) -> None:
+        """Open one session to a server and keep it alive via a background task."""
+        logger.debug("_connect_session called for %s (slot %d)", server_name, slot)
+        primary = slot == 0
+        # Bookkeeping key for this session's task and context
+        key = server_name if primary else f"{server_name}#{slot}"
 
         connection_event = asyncio.Event()
         connection_error: list[Optional[Exception]] = [None]
 
+        def _forget(session: Optional[ClientSession]) -> None:
+            if session is not None:
+                self._forget_session(server_name, session)
+
         async def _keep_connection() -> None:
+            session: Optional[ClientSession] = None
             try:
                 async with stdio_client(server_params) as (read_stream, write_stream):
                     session_obj = ClientSession(read_stream, write_stream)
                     session = await session_obj.__aenter__()
-                    self._server_contexts[server_name] = session_obj
+                    self._server_contexts[key] = session_obj
 
                     try:
                         try:
                             init_result = await asyncio.wait_for(session.initialize(), timeout=30.0)
-                            logger.info("Connected to underlying server: %s", server_name)
-                            if init_result.serverInfo:
-                                logger.info(
-                                    "     Server: %s, Version: %s",
-                                    init_result.serverInfo.name,
-                                    init_result.serverInfo.version,
-                                )
+                            if primary:
+                                logger.info("Connected to underlying server: %s", server_name)
+                                if init_result.serverInfo:
+                                    logger.info(
+                                        "     Server: %s, Version: %s",
+                                        init_result.serverInfo.name,
+                                        init_result.serverInfo.version,
+                                    )
                         except asyncio.TimeoutError:
-                            logger.error("Timeout initializing %s (30s)", server_name)
+                            logger.error("Timeout initializing %s (30s)", key)
                             connection_error[0] = Exception(f"Timeout connecting to {server_name}")
                             connection_event.set()
-                            await session_obj.__aexit__(None, None, None)
                             return
                         except Exception as exc:
-                            logger.error("Init exception for %s: %s", server_name, exc, exc_info=True)
+                            logger.error("Init exception for %s: %s", key, exc, exc_info=True)
                             connection_error[0] = exc
                             connection_event.set()
-                            await session_obj.__aexit__(None, None, None)
                             return
 
-                        self.underlying_servers[server_name] = session
+                        self._session_pools.setdefault(server_name, deque()).append(session)
+                        self._session_slots[session] = slot
                         self.metrics.connection_count += 1
 
-                        # Pre-load tools
-                        try:
-                            tools_result = await asyncio.wait_for(session.list_tools(), timeout=10.0)
-                            logger.info("     Loaded %d tools from %s", len(tools_result.tools), server_name)
-                            self.tools_cache[server_name] = tools_result.tools
-                            if tools_result.tools:
-                                sample = [t.name for t in tools_result.tools[:5]]
-                                logger.info(
-                                    "     Sample tools: %s%s",
-                                    sample,
-                                    "..." if len(tools_result.tools) > 5 else "",
-                                )
-                        except Exception as exc:
-                            logger.error("Could not list tools from %s: %s", server_name, exc, exc_info=True)
+                        if primary:
+                            self.underlying_servers[server_name] = session
+                            self._rebuild_server_index()
+
+                            # Pre-load tools
+                            try:
+                                tools_result = await asyncio.wait_for(session.list_tools(), timeout=10.0)
+                                logger.info("     Loaded %d tools from %s", len(tools_result.tools), server_name)
+                                self.tools_cache[server_name] = tools_result.tools
+                                # Tool list of the previous connection is stale now
+                                self._cached_list_tools = None
+                                if tools_result.tools and logger.isEnabledFor(logging.INFO):
+                                    sample = [t.name for t in tools_result.tools[:5]]
+                                    logger.info(
+                                        "     Sample tools: %s%s",
+                                        sample,
+                                        "..." if len(tools_result.tools) > 5 else "",
+                                    )
+                            except Exception as exc:
+                                logger.error("Could not list tools from %s: %s", server_name, exc, exc_info=True)
 
                         connection_event.set()
 
                         try:
-                            await asyncio.Event().wait()
+                            await self._shutdown_event.wait()
+                            logger.debug("Closing connection to %s", key)
                         except asyncio.CancelledError:
-                            logger.info("Connection to %s cancelled", server_name)
-                            self.underlying_servers.pop(server_name, None)
-                            ctx = self._server_contexts.pop(server_name, None)
-                            if ctx:
-                                try:
-                                    await ctx.__aexit__(None, None, None)
-                                except Exception:
-                                    pass
+                            logger.info("Connection to %s cancelled", key)
                             raise
+                        finally:
+                            _forget(session)
                     finally:
-                        ctx = self._server_contexts.pop(server_name, None)
+                        # Always exit the session here, in the task that entered it
+                        ctx = self._server_contexts.pop(key, None)
                         if ctx:
                             try:
                                 await ctx.__aexit__(None, None, None)
@@ -882,24 +1205,105 @@ class MCPProxyServer:
                                 pass
 
             except Exception as exc:
-                logger.error("Connection task failed for %s: %s", server_name, exc, exc_info=True)
+                logger.error("Connection task failed for %s: %s", key, exc, exc_info=True)
                 connection_error[0] = exc
                 connection_event.set()
-                self.underlying_servers.pop(server_name, None)
+                _forget(session)
 
         task = asyncio.create_task(_keep_connection())
-        self._connection_tasks[server_name] = task
+        self._connection_tasks[key] = task
 
         try:
             await asyncio.wait_for(connection_event.wait(), timeout=35.0)
         except asyncio.TimeoutError:
-            logger.error("Timeout waiting for connection to %s", server_name)
+            logger.error("Timeout waiting for connection to %s", key)
             task.cancel()
             raise Exception(f"Timeout waiting for connection to {server_name}")
+        except asyncio.CancelledError:
+            # e.g. a background reconnect made obsolete: don't leave the
+            # half-open session behind
+            task.cancel()
+            raise
 
         if connection_error[0]:
             raise connection_error[0]
 
+    def _acquire_session(self, server_name: str) -> ClientSession:
+        """Pick the next pooled session for *server_name* (round-robin)."""
+        pool = self._session_pools.get(server_name)
+        if pool:
+            pool.rotate(-1)
+            return pool[0]
+        return self.underlying_servers[server_name]
+
+    def _forget_session(self, server_name: str, session: ClientSession) -> None:
+        """Take *session* out of the pool; idempotent.
+
+        Forgetting the primary unregisters the server and closes the rest of
+        its pool too: extra slots only add capacity to a live primary.
+        """
+        self._session_slots.pop(session, None)
+        pool = self._session_pools.get(server_name)
+        if pool is not None:
+            try:
+                pool.remove(session)
+            except ValueError:
+                pass
+            if not pool:
+                del self._session_pools[server_name]
+
+        if self.underlying_servers.get(server_name) is not session:
+            return
+        del self.underlying_servers[server_name]
+        self._rebuild_server_index()
+        self._cached_list_tools = None
+        if self._shutdown_event.is_set():
+            return  # every connection task is closing its own session already
+        for other in self._session_pools.pop(server_name, ()):
+            slot = self._session_slots.pop(other, None)
+            if task := self._connection_tasks.get(f"{server_name}#{slot}"):
+                task.cancel()
+        for slot in range(1, max(1, self.settings.session_pool_size)):
+            if task := self._reconnect_tasks.get(f"{server_name}#{slot}"):
+                task.cancel()
+
+    def _evict_session(self, server_name: str, session: ClientSession) -> None:
+        """Drop a session whose connection died and reopen its slot in the background.
+
+        Called when ``call_tool`` fails with a closed-stream or connection
+        error, so dead pool members are found lazily, by the call that hits
+        them. The connection task is cancelled so it closes the session (and
+        its subprocess) in the task that opened it. Losing the primary
+        reconnects the whole server, pool included.
+        """
+        slot = self._session_slots.get(session)
+        if slot is None:
+            return  # already evicted, e.g. by a concurrent call
+        key = server_name if slot == 0 else f"{server_name}#{slot}"
+        logger.warning("Session %s lost its connection; reconnecting in the background", key)
+
+        self._forget_session(server_name, session)
+        if task := self._connection_tasks.get(key):
+            task.cancel()
+
+        server_params = self._server_params.get(server_name)
+        if server_params is None or self._shutdown_event.is_set() or key in self._reconnect_tasks:
+            return
+        if slot == 0:
+            reconnect = self._connect_to_server_sync(server_name, server_params)
+        else:
+            reconnect = self._connect_session(server_name, server_params, slot=slot)
+        task = asyncio.create_task(reconnect)
+        self._reconnect_tasks[key] = task
+
+        def _done(finished: asyncio.Task) -> None:
+            if self._reconnect_tasks.get(key) is finished:
+                del self._reconnect_tasks[key]
+            if not finished.cancelled() and (exc := finished.exception()) is not None:
+                logger.warning("Reconnecting %s failed: %s", key, exc)
+
+        task.add_done_callback(_done)
+
     async def initialize_underlying_servers(self) -> None:
         """Initialize connections to underlying MCP servers."""
         if not self.server_configs:
@@ -908,45 +1312,68 @@ class MCPProxyServer:
 
         logger.info("Initializing %d underlying server(s)...", len(self.server_configs))
 
-        for config in self.server_configs:
-            server_name = config["name"]
-            command = config["command"]
-            args = config.get("args", [])
+        # Connect concurrently: startup costs the slowest handshake, not the sum.
+        # _connect_one never raises, so one failure can't cancel its siblings.
+        async with asyncio.TaskGroup() as tg:
+            for config in self.server_configs:
+                tg.create_task(self._connect_one(config))
 
-            try:
-                logger.info("Connecting to %s (command: %s, args: %s)", server_name, command, args)
-                server_params = StdioServerParameters(command=command, args=args, env=None)
-                await self._connect_to_server_sync(server_name, server_params)
-            except Exception as exc:
-                logger.error("Failed to connect to %s: %s", server_name, exc, exc_info=True)
-                self.metrics.failed_connections += 1
+    async def _connect_one(self, config: Dict[str, Any]) -> None:
+        """Connect to a single configured server, recording failures in metrics."""
+        server_name = config["name"]
+        command = config["command"]
+        args = config.get("args", [])
+
+        try:
+            logger.info("Connecting to %s (command: %s, args: %s)", server_name, command, args)
+            server_params = StdioServerParameters(command=command, args=args, env=None)
+            await self._connect_to_server_sync(server_name, server_params)
+        except Exception as exc:
+            logger.error("Failed to connect to %s: %s", server_name, exc, exc_info=True)
+            self.metrics.failed_connections += 1
 
     async def cleanup(self) -> None:
         """Clean up connections to underlying servers."""
         try:
             logger.info("Cleaning up connections...")
             self.metrics.log_summary()
-            
+
+            # Abandon background calls nobody collected before the executor
+            # goes away, so none of them is left awaiting a dead pool
+            for _, task in self._background_tasks.values():
+                task.cancel()
+            await asyncio.gather(
+                *(task for _, task in self._background_tasks.values()),
+                return_exceptions=True,
+            )
+            self._background_tasks.clear()
+
             # Shutdown executor
             self.executor_manager.shutdown(wait=True)
-            
-            for server_name, session_obj in list(self._server_contexts.items()):
-                try:
-                    await session_obj.__aexit__(None, None, None)
-                except Exception as exc:
-                    logger.warning("Error closing %s: %s", server_name, exc)
-            self._server_contexts.clear()
 
-            for server_name, task in list(self._connection_tasks.items()):
-                if not task.done():
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
+            # Ask every connection task to close its own session, then wait
+            # for them all at once; stragglers get cancelled by wait_for.
+            self._shutdown_event.set()
+            for task in self._reconnect_tasks.values():
+                task.cancel()
+            await asyncio.gather(*self._reconnect_tasks.values(), return_exceptions=True)
+            self._reconnect_tasks.clear()
+            tasks = list(self._connection_tasks.values())
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*tasks, return_exceptions=True), timeout=10.0
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Timed out closing connections; cancelled remaining tasks")
             self._connection_tasks.clear()
+            self._server_contexts.clear()
+
             self.underlying_servers.clear()
+            self._session_pools.clear()
+            self._session_slots.clear()
+            self._rebuild_server_index()
             self.tools_cache.clear()
+            self._cached_list_tools = None
             await self.cache.clear()
         except Exception:
             pass
@@ -954,9 +1381,8 @@ class MCPProxyServer:
     async def run(self) -> None:
         """Run the proxy server."""
         try:
-            # Set event loop for executor
-            loop = asyncio.get_event_loop()
-            self.executor_manager.set_event_loop(loop)
+            # Set event loop for executor (run() always executes inside it)
+            self.executor_manager.set_event_loop(asyncio.get_running_loop())
             
             await self.initialize_underlying_servers()
 
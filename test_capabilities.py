@@ -48,9 +48,10 @@ async def test_capabilities():
             
             print("\n=== Capabilities Response ===")
             for content in result.content:
-                if hasattr(content, 'text'):
-                    print(content.text[:1000])  # First 1000 chars
-                    print(f"\n... (total {len(content.text)} chars)")
+                text = getattr(content, 'text', None)
+                if text is not None:
+                    print(text[:1000])  # First 1000 chars
+                    print(f"\n... (total {len(text)} chars)")
             
             # Check a regular tool to see if it has proxy hints
             print("\n=== Checking Regular Tool Description ===")
@@ -0,0 +1,90 @@
+"""
+Shared fixtures for the integration tests that talk to the proxy over stdio.
+
+One proxy subprocess and one initialised ``ClientSession`` serve every
+integration test in the session, instead of each test file spawning
+``uv run -m mcp_proxy`` and repeating the MCP handshake.
+"""
+
+import asyncio
+
+import pytest_asyncio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+
+PROXY_SERVER_PARAMS = StdioServerParameters(
+    command="uv",
+    args=["run", "-m", "mcp_proxy"],
+)
+
+
+async def wait_for_tools(session: ClientSession, min_count: int = 1, deadline_s: float = 10.0):
+    """Poll list_tools until at least *min_count* underlying-server tools appear.
+
+    The proxy's own ``proxy_*`` tools don't count. The proxy connects its
+    underlying servers before it starts serving, so this normally returns
+    on the first call instead of sleeping blindly; otherwise it re-polls
+    with a capped exponential backoff. Raises ``TimeoutError`` if the tools
+    are not there within *deadline_s* seconds.
+    """
+    last_count = 0
+
+    async def poll():
+        nonlocal last_count
+        delay = 0.05
+        while True:
+            tools_result = await session.list_tools()
+            last_count = sum(not t.name.startswith("proxy_") for t in tools_result.tools)
+            if last_count >= min_count:
+                return tools_result
+            # Back off (capped) so a slow server is not flooded with listings
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    try:
+        return await asyncio.wait_for(poll(), timeout=deadline_s)
+    except TimeoutError:
+        raise TimeoutError(
+            f"Underlying servers not ready after {deadline_s}s: expected at least "
+            f"{min_count} non-proxy tool(s), last listing had {last_count}"
+        ) from None
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def proxy_session():
+    """Yield ``(init_result, session)`` for one proxy shared by the whole run.
+
+    The stdio client and session are entered and exited inside a single
+    holder task: their anyio cancel scopes must close in the task that
+    opened them, while fixture setup and teardown may run in different ones.
+    """
+    loop = asyncio.get_running_loop()
+    ready: asyncio.Future = loop.create_future()
+    stop = asyncio.Event()
+
+    async def hold() -> None:
+        try:
+            async with stdio_client(PROXY_SERVER_PARAMS) as (read, write):
+                async with ClientSession(read, write) as session:
+                    init_result = await session.initialize()
+                    ready.set_result((init_result, session))
+                    await stop.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            raise
+
+    holder = asyncio.create_task(hold())
+    try:
+        yield await ready
+    finally:
+        stop.set()
+        await holder
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def proxy_tools_result(proxy_session):
+    """``list_tools`` result for the shared proxy, fetched once per run."""
+    _, session = proxy_session
+    return await wait_for_tools(session)
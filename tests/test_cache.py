@@ -2,12 +2,10 @@
 Unit tests for SmartCacheManager (async).
 """
 
-import time
-
 import pytest
 from mcp.types import TextContent
 
-from mcp_proxy.cache import SmartCacheManager
+from mcp_proxy.cache import AgentAwareCacheManager, SmartCacheManager, TTLMapping
 
 
 @pytest.mark.asyncio
@@ -32,22 +30,25 @@ async def test_get_missing_returns_none():
 
 @pytest.mark.asyncio
 async def test_ttl_expiration():
-    cache = SmartCacheManager(max_entries=10, ttl_seconds=0)  # 0s TTL
+    clock = [0.0]
+    cache = SmartCacheManager(max_entries=10, ttl_seconds=5, time_fn=lambda: clock[0])
     content = [TextContent(type="text", text="ephemeral")]
     cache_id = await cache.put(content, "t", {})
-    # Sleep long enough to exceed 0s TTL (Windows timer resolution ~16ms)
-    time.sleep(0.05)
+    clock[0] += 5.0
+    assert await cache.get(cache_id) is not None
+    clock[0] += 5.1  # access doesn't extend TTL
     assert await cache.get(cache_id) is None
 
 
 @pytest.mark.asyncio
 async def test_lru_eviction():
-    cache = SmartCacheManager(max_entries=2, ttl_seconds=300)
+    clock = [0.0]
+    cache = SmartCacheManager(max_entries=2, ttl_seconds=300, time_fn=lambda: clock[0])
     id1 = await cache.put([TextContent(type="text", text="a")], "t1", {})
     id2 = await cache.put([TextContent(type="text", text="b")], "t2", {})
 
     # Let some time pass so idle_seconds diverge after the access
-    time.sleep(0.05)
+    clock[0] += 1.0
 
     # Access id1 to keep it fresh (resets last_accessed_at)
     await cache.get(id1)
@@ -61,6 +62,23 @@ async def test_lru_eviction():
     assert await cache.get(id2) is None
 
 
+@pytest.mark.asyncio
+async def test_eviction_is_batched():
+    clock = [0.0]
+    cache = SmartCacheManager(max_entries=20, ttl_seconds=300, time_fn=lambda: clock[0])
+    ids = []
+    for i in range(20):
+        ids.append(await cache.put([TextContent(type="text", text=f"{i:02d}")], "t", {}))
+        clock[0] += 1.0
+
+    # Full: one put evicts 10% of capacity (the two idlest entries) at once
+    await cache.put([TextContent(type="text", text="new")], "t", {})
+    assert await cache.size() == 19
+    assert await cache.get(ids[0]) is None
+    assert await cache.get(ids[1]) is None
+    assert await cache.get(ids[2]) is not None
+
+
 @pytest.mark.asyncio
 async def test_remove():
     cache = SmartCacheManager()
@@ -110,4 +128,92 @@ async def test_unique_ids():
     for i in range(100):
         cid = await cache.put([TextContent(type="text", text=str(i))], "t", {})
         ids.add(cid)
-    assert len(ids) == 100  # all unique
\ No newline at end of file
+    assert len(ids) == 100  # all unique
+
+
+@pytest.mark.asyncio
+async def test_entry_ages_use_cache_clock():
+    clock = [100.0]
+    cache = SmartCacheManager(time_fn=lambda: clock[0])
+    cid = await cache.put([TextContent(type="text", text="x")], "t", {})
+    clock[0] += 7.0
+    entry = cache._entries[cid]
+    assert entry.age_seconds == 7.0
+    assert entry.idle_seconds == 7.0
+
+
+@pytest.mark.asyncio
+async def test_agent_cache_evicts_idlest_entry():
+    clock = [0.0]
+    cache = AgentAwareCacheManager(
+        max_entries_per_agent=2, ttl_seconds=300, time_fn=lambda: clock[0]
+    )
+    big = await cache.put([TextContent(type="text", text="a" * 100)], "t1", {}, agent_id="agent_1")
+    small = await cache.put([TextContent(type="text", text="b")], "t2", {}, agent_id="agent_1")
+    clock[0] += 199.0
+    assert await cache.get(big) is not None
+    clock[0] += 1.0
+
+    # Score = idle × size / accesses: big is 1s × 100 = 100, small is
+    # 200s × 1 = 200, so the long-idle small entry goes first
+    newest = await cache.put([TextContent(type="text", text="c")], "t3", {}, agent_id="agent_1")
+
+    assert await cache.get(small) is None
+    assert await cache.get(big) is not None
+    assert await cache.get(newest) is not None
+
+
+@pytest.mark.asyncio
+async def test_agent_cache_evicts_least_recent_agent():
+    clock = [0.0]
+    cache = AgentAwareCacheManager(max_total_agents=2, time_fn=lambda: clock[0])
+    id1 = await cache.put([TextContent(type="text", text="a")], "t", {}, agent_id="agent_1")
+    clock[0] += 1.0
+    await cache.put([TextContent(type="text", text="b")], "t", {}, agent_id="agent_2")
+    clock[0] += 1.0
+    assert await cache.get(id1) is not None  # agent_1 is now the most recent
+
+    clock[0] += 1.0
+    await cache.put([TextContent(type="text", text="c")], "t", {}, agent_id="agent_3")
+    assert await cache.size("agent_2") == 0
+    assert await cache.size("agent_1") == 1
+
+
+def test_ttl_mapping_bounded():
+    mapping = TTLMapping(maxsize=2, ttl_seconds=60)
+    mapping["a"] = "agent_1"
+    mapping["b"] = "agent_2"
+    assert mapping.get("a") == "agent_1"  # refreshes "a"
+    mapping["c"] = "agent_3"
+    assert len(mapping) == 2
+    assert "b" not in mapping
+    assert mapping.get("a") == "agent_1"
+    assert mapping.get("c") == "agent_3"
+
+
+def test_ttl_mapping_expiration():
+    clock = [0.0]
+    mapping = TTLMapping(maxsize=10, ttl_seconds=60, time_fn=lambda: clock[0])
+    mapping["s"] = "agent_1"
+    clock[0] += 30.0
+    assert mapping.get("s") == "agent_1"  # sliding: refreshed here
+    clock[0] += 61.0
+    assert mapping.get("s") is None
+    assert len(mapping) == 0
+
+
+def test_ttl_mapping_contains_does_not_refresh():
+    clock = [0.0]
+    mapping = TTLMapping(maxsize=2, ttl_seconds=60, time_fn=lambda: clock[0])
+    mapping["a"] = "agent_1"
+    mapping["b"] = "agent_2"
+    clock[0] += 50.0
+    assert "a" in mapping
+    # The check neither moved "a" to the MRU end...
+    mapping["c"] = "agent_3"
+    assert "a" not in mapping
+    assert "b" in mapping
+    # ...nor extended its TTL
+    clock[0] += 11.0
+    assert "b" not in mapping
+    assert mapping.get("b") is None
@@ -3,11 +3,11 @@ Unit tests for configuration loading, including ProxySettings.
 """
 
 import json
-import os
-import tempfile
 import pytest
 
-from mcp_proxy.config import ProxySettings, load_config
+from pydantic import ValidationError
+
+from mcp_proxy.config import ProxySettings, ServerConfig, load_config
 
 
 class TestProxySettings:
@@ -39,63 +39,92 @@ class TestProxySettings:
         assert ps.cache_max_entries == 50
 
 
-class TestLoadConfig:
-    """Tests for load_config returning (servers, proxy_settings)."""
-
-    def test_load_with_proxy_settings(self, tmp_path):
-        config = {
-            "mcpServers": {
-                "test": {
-                    "command": "echo",
-                    "args": ["hello"],
-                }
-            },
-            "proxySettings": {
-                "maxResponseSize": 5000,
-                "cacheTTLSeconds": 120,
-            },
+class TestServerConfig:
+    """Validation rules on a single server entry."""
+
+    def test_valid(self):
+        sc = ServerConfig(name="  fs  ", command=" npx ", args=["-y", "pkg"])
+        assert sc.name == "fs"
+        assert sc.command == "npx"
+        assert sc.args == ["-y", "pkg"]
+
+    @pytest.mark.parametrize(
+        "name,command,message",
+        [
+            ("", "node", "cannot be empty"),
+            ("   ", "node", "cannot be empty"),
+            ("server@name", "node", "pattern"),
+            ("server", "", "at least 1 character"),
+            ("server", "   ", "Command cannot be empty"),
+        ],
+    )
+    def test_invalid(self, name, command, message):
+        with pytest.raises(ValidationError, match=message):
+            ServerConfig(name=name, command=command)
+
+
+_CONFIGS = {
+    "with_settings": {
+        "mcpServers": {
+            "test": {
+                "command": "echo",
+                "args": ["hello"],
+            }
+        },
+        "proxySettings": {
+            "maxResponseSize": 5000,
+            "cacheTTLSeconds": 120,
+        },
+    },
+    "without_settings": {
+        "mcpServers": {
+            "test": {"command": "echo", "args": []},
         }
-        config_file = tmp_path / "mcp.json"
+    },
+    "empty_servers": {"mcpServers": {}},
+    "missing_key": {"other": "stuff"},
+}
+
+
+@pytest.fixture(scope="module")
+def config_files(tmp_path_factory):
+    """Write every config in ``_CONFIGS`` once per module; map key -> path."""
+    directory = tmp_path_factory.mktemp("config")
+    files = {}
+    for key, config in _CONFIGS.items():
+        config_file = directory / f"{key}.json"
         config_file.write_text(json.dumps(config))
+        files[key] = str(config_file)
+    files["missing"] = str(directory / "nonexistent.json")
+    return files
+
+
+class TestLoadConfig:
+    """Tests for load_config returning (servers, proxy_settings)."""
 
-        servers, ps = load_config(str(config_file))
+    def test_load_with_proxy_settings(self, config_files):
+        servers, ps = load_config(config_files["with_settings"])
         assert len(servers) == 1
         assert servers[0]["name"] == "test"
         assert ps.max_response_size == 5000
         assert ps.cache_ttl_seconds == 120
         assert ps.cache_max_entries == 50  # default
 
-    def test_load_without_proxy_settings(self, tmp_path):
-        config = {
-            "mcpServers": {
-                "test": {"command": "echo", "args": []},
-            }
-        }
-        config_file = tmp_path / "mcp.json"
-        config_file.write_text(json.dumps(config))
-
-        servers, ps = load_config(str(config_file))
+    def test_load_without_proxy_settings(self, config_files):
+        servers, ps = load_config(config_files["without_settings"])
         assert len(servers) == 1
         # Defaults
         assert ps.max_response_size == 8000
 
-    def test_load_missing_file(self, tmp_path):
-        servers, ps = load_config(str(tmp_path / "nonexistent.json"))
+    def test_load_missing_file(self, config_files):
+        servers, ps = load_config(config_files["missing"])
         assert servers == []
         assert isinstance(ps, ProxySettings)
 
-    def test_load_empty_mcpServers(self, tmp_path):
-        config = {"mcpServers": {}}
-        config_file = tmp_path / "mcp.json"
-        config_file.write_text(json.dumps(config))
-
-        servers, ps = load_config(str(config_file))
+    def test_load_empty_mcpServers(self, config_files):
+        servers, ps = load_config(config_files["empty_servers"])
         assert servers == []
 
-    def test_load_missing_mcpServers_key(self, tmp_path):
-        config = {"other": "stuff"}
-        config_file = tmp_path / "mcp.json"
-        config_file.write_text(json.dumps(config))
-
+    def test_load_missing_mcpServers_key(self, config_files):
         with pytest.raises(ValueError, match="Missing 'mcpServers'"):
-            load_config(str(config_file))
+            load_config(config_files["missing_key"])
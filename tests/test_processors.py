@@ -4,10 +4,12 @@ ProcessorPipeline, and BaseProcessor.
 """
 
 import json
+import re
 import pytest
 from mcp.types import TextContent
 
 from mcp_proxy.processors import (
+    _DENSE_HITS,
     GrepProcessor,
     ProcessorPipeline,
     ProcessorResult,
@@ -121,6 +123,20 @@ class TestProjectionProcessor:
         assert len(result) == 1
         assert result[0].text == "This is plain text"
 
+    def test_project_content_unchanged_is_passed_through(self):
+        text = json.dumps({"name": "John", "email": "john@example.com"})
+        content = [TextContent(type="text", text=text)]
+        projection = {"mode": "include", "fields": ["name", "email"]}
+        result = ProjectionProcessor.project_content(content, projection)
+        assert result[0] is content[0]
+        assert result[0].text == text
+
+    async def test_project_content_async_unchanged_is_passed_through(self, projection_processor):
+        content = [TextContent(type="text", text='{"a": 1, "b": 2}')]
+        projection = {"mode": "exclude", "fields": ["missing"]}
+        result = await projection_processor.project_content_async(content, projection)
+        assert result[0] is content[0]
+
     def test_process_returns_processor_result(self, projection_processor):
         """BaseProcessor.process() returns a ProcessorResult."""
         json_data = {"name": "John", "email": "john@example.com", "age": 30}
@@ -289,6 +305,24 @@ class TestGrepProcessor:
         assert "Line 4: ERROR" in text
         assert "Line 5: WARN" in text
 
+    @pytest.mark.parametrize(
+        "pattern, expected",
+        [
+            # Windows [1-3] and [4-6] touch: one block, no separator
+            ("L2|L5", "L1\nL2\nL3\nL4\nL5\nL6"),
+            # Windows [1-3] and [3-5] overlap: line 3 is shown once
+            ("L2|L4", "L1\nL2\nL3\nL4\nL5"),
+            # Windows [1-3] and [5-7] leave exactly line 4 out
+            ("L2|L6", "L1\nL2\nL3\n---\nL5\nL6\nL7"),
+        ],
+        ids=["adjacent", "overlapping", "one-line-gap"],
+    )
+    def test_grep_context_separators(self, grep_processor, pattern, expected):
+        content = [TextContent(type="text", text="\n".join(f"L{i}" for i in range(10)))]
+        grep_spec = {"pattern": pattern, "contextLines": {"both": 1}}
+        result = grep_processor.apply_grep(content, grep_spec)
+        assert result[0].text == expected
+
     def test_grep_multiline_pattern(self, grep_processor):
         content = [
             TextContent(
@@ -383,6 +417,100 @@ class TestGrepProcessor:
         assert "Error" in result[0].text
 
 
+# ---------------------------------------------------------------------------
+# Whole-text line matching
+# ---------------------------------------------------------------------------
+
+def _per_line_indices(lines, regex, limit=None):
+    """Reference result: search every line on its own."""
+    found = [i for i, line in enumerate(lines) if regex.search(line)]
+    return found[:limit] if limit else found
+
+
+class TestMatchingLineIndices:
+    """_matching_line_indices must agree with a plain per-line search."""
+
+    TEXT = "\n".join([
+        "foo bar",
+        "foo",
+        "bar foo",
+        "  ERROR: disk full",
+        "error: retrying",
+        "ERROR",
+        "",
+        "done",
+        "not done yet",
+    ])
+
+    def assert_matches_per_line(self, pattern, flags=0, text=TEXT, limit=None):
+        regex = re.compile(pattern, flags)
+        lines = text.split("\n")
+        expected = _per_line_indices(lines, regex, limit)
+        assert GrepProcessor._matching_line_indices(text, lines, regex, limit) == expected
+        return expected
+
+    def test_pattern_with_newline_escape(self):
+        # Can never match within a single line
+        assert self.assert_matches_per_line(r"foo\nbar") == []
+        assert self.assert_matches_per_line("bar\nfoo") == []
+
+    def test_pattern_with_whitespace_class(self):
+        # "\s" would also match the newline between "foo" and "bar foo"
+        assert self.assert_matches_per_line(r"foo\s+bar") == [0]
+        assert self.assert_matches_per_line(r"\s") == [0, 2, 3, 4, 8]
+
+    def test_anchors(self):
+        assert self.assert_matches_per_line(r"^ERROR") == [5]
+        assert self.assert_matches_per_line(r"done$") == [7]
+        assert self.assert_matches_per_line(r"^$") == [6]
+        assert self.assert_matches_per_line(r"^foo$") == [1]
+        assert self.assert_matches_per_line(r"foo$|^bar") == [1, 2]
+
+    def test_case_insensitive(self):
+        assert self.assert_matches_per_line(r"error", re.IGNORECASE) == [3, 4, 5]
+        assert self.assert_matches_per_line(r"^error", re.IGNORECASE) == [4, 5]
+
+    @pytest.mark.parametrize("pattern", [r"ERR\d", "ERR"])
+    def test_dense_matches(self, pattern):
+        # Sparse at first, then well over _DENSE_HITS hits so the sweep
+        # hands over to the per-line scan part way through
+        lines = ["ok"] * 200 + [f"ERR{i % 10}" if i % 2 else "ok" for i in range(400)]
+        text = "\n".join(lines)
+        expected = self.assert_matches_per_line(pattern, text=text)
+        assert len(expected) > _DENSE_HITS
+        self.assert_matches_per_line(pattern, text=text, limit=_DENSE_HITS + 10)
+
+
+    # -- Literal alternation fast path ------------------------------------
+
+    def test_alternation_with_escaped_metacharacters(self):
+        text = "v1.0\nv1x0\na|b\na\n(x)\nb"
+        assert self.assert_matches_per_line(r"1\.0|\(x\)", text=text) == [0, 4]
+        assert self.assert_matches_per_line(r"a\|b", text=text) == [2]
+        assert self.assert_matches_per_line(r"a|b", text=text) == [2, 3, 5]
+
+    def test_alternation_case_insensitive(self, grep_processor):
+        assert self.assert_matches_per_line(r"ERROR|done", re.IGNORECASE) == [3, 4, 5, 7, 8]
+        content = [TextContent(type="text", text=self.TEXT)]
+        result = grep_processor.apply_grep(
+            content, {"pattern": "error|DONE", "caseInsensitive": True}
+        )
+        assert result[0].text == "  ERROR: disk full\nerror: retrying\nERROR\ndone\nnot done yet"
+
+    @pytest.mark.parametrize("pattern", ["ERR|ERROR", "ERROR|ERR"])
+    def test_alternative_that_prefixes_another(self, pattern):
+        text = "ERR\nERROR\nok\nERRORS\nER"
+        assert self.assert_matches_per_line(pattern, text=text) == [0, 1, 3]
+        assert self.assert_matches_per_line(pattern, text=text, limit=2) == [0, 1]
+
+    def test_dense_alternation(self):
+        lines = [f"ERR{i}" if i % 3 == 0 else (f"WARN{i}" if i % 3 == 1 else "ok") for i in range(600)]
+        text = "\n".join(lines)
+        expected = self.assert_matches_per_line("ERR|WARN", text=text)
+        assert len(expected) == 400
+        self.assert_matches_per_line("ERR|WARN", text=text, limit=_DENSE_HITS + 1)
+
+
 # ---------------------------------------------------------------------------
 # ProcessorPipeline
 # ---------------------------------------------------------------------------
@@ -423,6 +551,33 @@ class TestProcessorPipeline:
         assert "projection" in result.metadata
         assert "grep" in result.metadata
 
+    def test_pipeline_grep_after_noop_projection_sees_original_text(self):
+        # The projection keeps every field, so grep runs over the original
+        # single-line JSON and the whole document is the matching line
+        pipeline = ProcessorPipeline([ProjectionProcessor(), GrepProcessor()])
+        text = json.dumps({"name": "John", "city": "NYC"})
+        content = [TextContent(type="text", text=text)]
+        result = pipeline.execute(
+            content,
+            {
+                "projection": {"mode": "include", "fields": ["name", "city"]},
+                "grep": {"pattern": "John"},
+            },
+        )
+        assert result.content[0].text == text
+
+    def test_pipeline_grep_after_projection_sees_indented_json(self):
+        pipeline = ProcessorPipeline([ProjectionProcessor(), GrepProcessor()])
+        content = [TextContent(type="text", text=json.dumps({"name": "John", "city": "NYC"}))]
+        result = pipeline.execute(
+            content,
+            {
+                "projection": {"mode": "include", "fields": ["name"]},
+                "grep": {"pattern": "John"},
+            },
+        )
+        assert result.content[0].text == '  "name": "John"'
+
     def test_pipeline_skips_unused_processors(self):
         pipeline = ProcessorPipeline([ProjectionProcessor(), GrepProcessor()])
         content = [TextContent(type="text", text="hello world")]
@@ -0,0 +1,509 @@
+"""
+Unit tests for MCPProxyServer internals that do not need a live
+underlying server.
+"""
+
+import asyncio
+import contextlib
+import gc
+import json
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+from mcp import StdioServerParameters
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, CallToolResult, ErrorData, ListToolsResult, TextContent
+
+import mcp_proxy.server as server_module
+from mcp_proxy.cache import TTLMapping
+from mcp_proxy.config import ProxySettings
+from mcp_proxy.server import (
+    _MAX_BACKGROUND_TASKS,
+    _PROCESS_OFFLOAD_THRESHOLD,
+    _SESSION_TTL_SECONDS,
+    MCPProxyServer,
+    _current_session,
+)
+
+
+class FakeSession:
+    """Stands in for an underlying server's ClientSession."""
+
+    def __init__(self, name="srv", text=None):
+        self.name = name
+        self.text = text  # reply text; defaults to "<name>:<tool>"
+        self.calls = []
+        self.release = None  # set to an asyncio.Event to hold calls open
+
+    async def call_tool(self, tool_name, arguments):
+        self.calls.append((tool_name, arguments))
+        if self.release is not None:
+            await self.release.wait()
+        text = self.text if self.text is not None else f"{self.name}:{tool_name}"
+        return CallToolResult(content=[TextContent(type="text", text=text)])
+
+
+class FakeClientSession(FakeSession):
+    """ClientSession replacement for _connect_session (see ``transport``)."""
+
+    opened = None  # list every instance is appended to; set by the fixture
+    failing_init = ()  # names whose initialize() fails
+
+    def __init__(self, read_stream, write_stream):
+        super().__init__(f"s{len(self.opened)}")
+        self.opened.append(self)
+        self.dead = False  # set to make calls fail as if the process exited
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+    async def initialize(self):
+        if self.name in self.failing_init:
+            raise RuntimeError("slot failed")
+        return SimpleNamespace(serverInfo=None)
+
+    async def list_tools(self):
+        return ListToolsResult(tools=[])
+
+    async def call_tool(self, tool_name, arguments):
+        if self.dead:
+            raise McpError(ErrorData(code=CONNECTION_CLOSED, message="Connection closed"))
+        return await super().call_tool(tool_name, arguments)
+
+
+@contextlib.contextmanager
+def client_session(session_id):
+    """Run the block as if handling a request from *session_id*."""
+    token = _current_session.set(session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+class ClientSessionStub:
+    """Stands in for the ServerSession of a connected MCP client."""
+
+
+@contextlib.contextmanager
+def mcp_request(session):
+    """Run the block as if inside an MCP request from client *session*."""
+    token = request_ctx.set(SimpleNamespace(session=session))
+    try:
+        yield
+    finally:
+        request_ctx.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def proxy():
+    server = MCPProxyServer(proxy_settings=ProxySettings())
+    yield server
+    server.executor_manager.shutdown()
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Make _connect_session open FakeClientSessions; yields the opened list."""
+
+    @contextlib.asynccontextmanager
+    async def fake_stdio_client(params):
+        yield None, None
+
+    opened = []
+    monkeypatch.setattr(FakeClientSession, "opened", opened)
+    monkeypatch.setattr(server_module, "stdio_client", fake_stdio_client)
+    monkeypatch.setattr(server_module, "ClientSession", FakeClientSession)
+    return opened
+
+
+@pytest.fixture
+async def pooled_proxy(transport):
+    """A proxy connected to server "srv" with a pool of three sessions."""
+    server = MCPProxyServer(proxy_settings=ProxySettings(session_pool_size=3))
+    await server._connect_to_server_sync("srv", StdioServerParameters(command="srv"))
+    yield server
+    await server.cleanup()
+
+
+@pytest.fixture
+def fake_session(proxy):
+    session = FakeSession()
+    proxy.underlying_servers["srv"] = session
+    proxy._rebuild_server_index()
+    return session
+
+
+# ---------------------------------------------------------------------------
+# Exploration metadata
+# ---------------------------------------------------------------------------
+
+class TestExplorationMetadata:
+    """Tests for MCPProxyServer._create_exploration_metadata."""
+
+    async def test_process_offload_matches_in_process(self, proxy):
+        records = [{"id": i, "name": f"user{i}", "tags": ["a", "b"]} for i in range(2000)]
+        content = [TextContent(type="text", text=json.dumps({"users": records}))]
+        assert len(content[0].text) > _PROCESS_OFFLOAD_THRESHOLD
+
+        offloaded = await proxy._create_exploration_metadata(content, cache_id="abc123")
+        in_process = proxy.recursive_context_manager.create_exploration_metadata(
+            content, cache_id="abc123"
+        )
+        assert offloaded is not None
+        assert offloaded == in_process
+        assert proxy.executor_manager._process_pool is not None
+
+
+# ---------------------------------------------------------------------------
+# Content sources
+# ---------------------------------------------------------------------------
+
+class TestResolveContentSource:
+    """Tests for MCPProxyServer._resolve_content_source."""
+
+    async def test_cache_id_wins_over_fresh_call(self, proxy, fake_session):
+        cached = [TextContent(type="text", text="from cache")]
+        cache_id = await proxy.cache.put(cached, "srv_echo", {}, agent_id=await proxy._get_agent_id())
+        content = await proxy._resolve_content_source(
+            {"cache_id": cache_id, "tool": "srv_echo", "arguments": {}}
+        )
+        assert content[0].text == "from cache"
+        assert fake_session.calls == []
+
+    async def test_unknown_cache_id_does_not_fall_back(self, proxy, fake_session):
+        with pytest.raises(ValueError, match="not found or expired"):
+            await proxy._resolve_content_source({"cache_id": "agent_1:nope", "tool": "srv_echo"})
+        assert fake_session.calls == []
+
+    async def test_fresh_call(self, proxy, fake_session):
+        content = await proxy._resolve_content_source({"tool": "srv_echo", "arguments": {"x": 1}})
+        assert content[0].text == "srv:echo"
+        assert fake_session.calls == [("echo", {"x": 1})]
+
+    async def test_requires_a_source(self, proxy):
+        with pytest.raises(ValueError, match="Provide either"):
+            await proxy._resolve_content_source({})
+
+    @pytest.mark.parametrize("size, cached", [(49, 0), (50, 1), (500, 1)])
+    async def test_fresh_result_cached_from_half_max_response_size(self, size, cached):
+        proxy = MCPProxyServer(proxy_settings=ProxySettings(max_response_size=100))
+        proxy.underlying_servers["srv"] = FakeSession(text="x" * size)
+        proxy._rebuild_server_index()
+
+        content = await proxy._resolve_content_source({"tool": "srv_dump"})
+        assert len(content[0].text) == size
+        assert await proxy.cache.size(await proxy._get_agent_id()) == cached
+
+
+# ---------------------------------------------------------------------------
+# Background calls
+# ---------------------------------------------------------------------------
+
+def _handle_of(result):
+    """Extract the handle from a proxy_background_call reply."""
+    return result[0].text.split('handle="', 1)[1].split('"', 1)[0]
+
+
+class TestBackgroundCalls:
+    """Tests for proxy_background_call / proxy_get_result."""
+
+    async def test_collect_result(self, proxy, fake_session):
+        started = await proxy._handle_proxy_background_call({"tool": "srv_echo", "arguments": {"x": 1}})
+        handle = _handle_of(started)
+        result = await proxy._handle_proxy_get_result({"handle": handle})
+        assert result[0].text == "srv:echo"
+        assert fake_session.calls == [("echo", {"x": 1})]
+        # A handle can be collected only once
+        again = await proxy._handle_proxy_get_result({"handle": handle})
+        assert "not found" in again[0].text
+
+    async def test_unknown_handle(self, proxy):
+        result = await proxy._handle_proxy_get_result({"handle": "doesnotexist"})
+        assert "not found" in result[0].text
+
+    async def test_still_running(self, proxy, fake_session):
+        fake_session.release = asyncio.Event()
+        handle = _handle_of(await proxy._handle_proxy_background_call({"tool": "srv_slow"}))
+
+        result = await proxy._handle_proxy_get_result({"handle": handle, "timeout": 0})
+        assert "still running" in result[0].text
+        assert handle in proxy._background_tasks
+
+        fake_session.release.set()
+        result = await proxy._handle_proxy_get_result({"handle": handle, "timeout": 5})
+        assert result[0].text == "srv:slow"
+
+    async def test_failed_call(self, proxy, fake_session, monkeypatch):
+        async def failing(name, arguments):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(proxy, "_forward_tool_call", failing)
+        handle = _handle_of(await proxy._handle_proxy_background_call({"tool": "srv_echo"}))
+        result = await proxy._handle_proxy_get_result({"handle": handle})
+        assert result[0].text == "Error: boom"
+        assert handle not in proxy._background_tasks
+
+    @pytest.mark.parametrize("timeout", ["soon", None, float("nan"), [1]])
+    async def test_invalid_timeout(self, proxy, fake_session, timeout):
+        handle = _handle_of(await proxy._handle_proxy_background_call({"tool": "srv_echo"}))
+        result = await proxy._handle_proxy_get_result({"handle": handle, "timeout": timeout})
+        assert "'timeout' must be a number" in result[0].text
+        assert handle in proxy._background_tasks
+
+    async def test_timeout_is_clamped(self, proxy, fake_session, monkeypatch):
+        waits = []
+        real_wait = asyncio.wait
+
+        async def recording_wait(tasks, timeout=None):
+            waits.append(timeout)
+            return await real_wait(tasks, timeout=timeout)
+
+        monkeypatch.setattr(asyncio, "wait", recording_wait)
+        for timeout in (-5, "1e9", "2.5"):
+            handle = _handle_of(await proxy._handle_proxy_background_call({"tool": "srv_echo"}))
+            await proxy._handle_proxy_get_result({"handle": handle, "timeout": timeout})
+        assert waits == [0.0, 300.0, 2.5]
+
+    async def test_task_cap(self, proxy, fake_session, monkeypatch):
+        fake_session.release = asyncio.Event()
+        for _ in range(_MAX_BACKGROUND_TASKS):
+            await proxy._handle_proxy_background_call({"tool": "srv_slow"})
+        assert len(proxy._background_tasks) == _MAX_BACKGROUND_TASKS
+
+        result = await proxy._handle_proxy_background_call({"tool": "srv_slow"})
+        assert "already running" in result[0].text
+        assert len(proxy._background_tasks) == _MAX_BACKGROUND_TASKS
+
+        # Finished (here: failed) calls nobody collected make room, and their
+        # exceptions are retrieved so asyncio does not report them on GC
+        async def failing(name, arguments):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(proxy, "_forward_tool_call", failing)
+        handle, (_, task) = next(iter(proxy._background_tasks.items()))
+        task.cancel()
+        failed = asyncio.create_task(failing("srv_echo", {}))
+        await asyncio.wait({task, failed})
+        proxy._background_tasks[handle] = (proxy._background_tasks[handle][0], failed)
+        del task, failed
+
+        unretrieved = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _, context: unretrieved.append(context))
+        try:
+            result = await proxy._handle_proxy_background_call({"tool": "srv_echo"})
+            assert "Started" in result[0].text
+            assert handle not in proxy._background_tasks
+            gc.collect()
+        finally:
+            loop.set_exception_handler(None)
+        assert unretrieved == []
+
+        fake_session.release.set()
+        await asyncio.gather(
+            *(task for _, task in proxy._background_tasks.values()), return_exceptions=True
+        )
+
+    async def test_cleanup_cancels_before_executor_shutdown(self, proxy, fake_session, monkeypatch):
+        fake_session.release = asyncio.Event()
+        handle = _handle_of(await proxy._handle_proxy_background_call({"tool": "srv_slow"}))
+        _, task = proxy._background_tasks[handle]
+        seen = []
+        real_shutdown = proxy.executor_manager.shutdown
+
+        def recording_shutdown(wait=True):
+            seen.append(task.cancelled())
+            real_shutdown(wait=wait)
+
+        monkeypatch.setattr(proxy.executor_manager, "shutdown", recording_shutdown)
+        await proxy.cleanup()
+        assert seen[0] is True
+        assert proxy._background_tasks == {}
+
+    async def test_handles_are_per_session(self, proxy, fake_session):
+        with client_session("session-a"):
+            handle = _handle_of(await proxy._handle_proxy_background_call({"tool": "srv_echo"}))
+        with client_session("session-b"):
+            result = await proxy._handle_proxy_get_result({"handle": handle})
+            assert "not found" in result[0].text
+        with client_session("session-a"):
+            result = await proxy._handle_proxy_get_result({"handle": handle})
+            assert result[0].text == "srv:echo"
+
+
+# ---------------------------------------------------------------------------
+# Session / agent identity
+# ---------------------------------------------------------------------------
+
+class TestSessionIdentity:
+    """Tests for MCPProxyServer._request_session_id."""
+
+    def test_outside_request_is_default(self, proxy):
+        assert proxy._request_session_id() == "default"
+
+    def test_stable_per_session(self, proxy):
+        first, second = ClientSessionStub(), ClientSessionStub()
+        with mcp_request(first):
+            first_id = proxy._request_session_id()
+            assert proxy._request_session_id() == first_id
+        with mcp_request(second):
+            assert proxy._request_session_id() != first_id
+
+    def test_closed_session_id_is_not_reused(self, proxy):
+        seen = set()
+        # Freed objects' id()s get recycled; their session IDs must not be
+        for _ in range(20):
+            session = ClientSessionStub()
+            with mcp_request(session):
+                session_id = proxy._request_session_id()
+            assert session_id not in seen
+            seen.add(session_id)
+            del session
+        gc.collect()
+        assert len(proxy._session_ids) == 0
+
+    async def test_agent_id_reused_per_session(self, proxy):
+        with client_session("session-a"):
+            agent_a = await proxy._get_agent_id()
+            assert await proxy._get_agent_id() == agent_a
+        with client_session("session-b"):
+            assert await proxy._get_agent_id() != agent_a
+        with client_session("session-a"):
+            assert await proxy._get_agent_id() == agent_a
+
+    async def test_agent_id_expires_after_idle_ttl(self, proxy):
+        clock = [0.0]
+        proxy._session_to_agent = TTLMapping(
+            maxsize=10, ttl_seconds=_SESSION_TTL_SECONDS, time_fn=lambda: clock[0]
+        )
+        with client_session("session-a"):
+            agent = await proxy._get_agent_id()
+            # Each lookup counts as activity and keeps the mapping alive
+            clock[0] += _SESSION_TTL_SECONDS - 1
+            assert await proxy._get_agent_id() == agent
+            clock[0] += _SESSION_TTL_SECONDS - 1
+            assert await proxy._get_agent_id() == agent
+            clock[0] += _SESSION_TTL_SECONDS + 1
+            assert await proxy._get_agent_id() != agent
+
+    async def test_agent_id_disabled_without_isolation(self):
+        proxy = MCPProxyServer(proxy_settings=ProxySettings(enable_agent_isolation=False))
+        assert await proxy._get_agent_id() is None
+
+
+# ---------------------------------------------------------------------------
+# Session pool
+# ---------------------------------------------------------------------------
+
+class TestSessionPool:
+    """Tests for pooled sessions (``session_pool_size`` > 1)."""
+
+    async def test_acquire_session_round_robin(self, proxy):
+        sessions = [FakeSession(f"s{i}") for i in range(3)]
+        proxy.underlying_servers["srv"] = sessions[0]
+        proxy._session_pools["srv"] = deque(sessions)
+        proxy._rebuild_server_index()
+
+        picked = [proxy._acquire_session("srv") for _ in range(6)]
+        assert picked == [sessions[1], sessions[2], sessions[0]] * 2
+
+        results = [await proxy._forward_tool_call("srv_echo", {}) for _ in range(3)]
+        assert sorted(r[0].text for r in results) == ["s0:echo", "s1:echo", "s2:echo"]
+
+    async def test_acquire_session_without_pool(self, proxy, fake_session):
+        assert proxy._acquire_session("srv") is fake_session
+
+    async def test_failed_extra_slot_shrinks_pool(self, transport, monkeypatch):
+        monkeypatch.setattr(FakeClientSession, "failing_init", ("s1",))
+        proxy = MCPProxyServer(proxy_settings=ProxySettings(session_pool_size=3))
+        try:
+            await proxy._connect_to_server_sync("srv", StdioServerParameters(command="srv"))
+            # The primary registered the server; the failed slot left the pool
+            assert proxy.underlying_servers["srv"] is transport[0]
+            assert list(proxy._session_pools["srv"]) == [transport[0], transport[2]]
+            assert {proxy._acquire_session("srv") for _ in range(4)} == {transport[0], transport[2]}
+        finally:
+            await proxy.cleanup()
+        assert proxy._session_pools == {}
+
+    async def test_dead_extra_session_is_replaced(self, pooled_proxy, transport):
+        primary, dead, healthy = transport
+        dead.dead = True
+        old_task = pooled_proxy._connection_tasks["srv#1"]
+
+        # Round-robin hands out slot 1 first; its failure evicts it
+        result = await pooled_proxy._forward_tool_call("srv_echo", {})
+        assert "Connection closed" in result[0].text
+        assert dead not in pooled_proxy._session_pools["srv"]
+        await asyncio.gather(old_task, return_exceptions=True)
+        assert dead.closed
+
+        await pooled_proxy._reconnect_tasks["srv#1"]
+        replacement = transport[3]
+        assert set(pooled_proxy._session_pools["srv"]) == {primary, healthy, replacement}
+        assert pooled_proxy._session_slots[replacement] == 1
+        assert pooled_proxy.underlying_servers["srv"] is primary
+        results = [await pooled_proxy._forward_tool_call("srv_echo", {}) for _ in range(3)]
+        assert sorted(r[0].text for r in results) == ["s0:echo", "s2:echo", "s3:echo"]
+
+    async def test_dead_primary_reconnects_whole_pool(self, pooled_proxy, transport):
+        primary, extra1, extra2 = transport
+        primary.dead = True
+        old_tasks = list(pooled_proxy._connection_tasks.values())
+
+        # Slots 1 and 2 come first in the rotation, then the primary
+        for _ in range(3):
+            result = await pooled_proxy._forward_tool_call("srv_echo", {})
+        assert "Connection closed" in result[0].text
+        assert "srv" not in pooled_proxy.underlying_servers
+        assert "srv" not in pooled_proxy._session_pools
+        await asyncio.gather(*old_tasks, return_exceptions=True)
+        assert primary.closed and extra1.closed and extra2.closed
+
+        await pooled_proxy._reconnect_tasks["srv"]
+        assert pooled_proxy.underlying_servers["srv"] is transport[3]
+        assert list(pooled_proxy._session_pools["srv"]) == transport[3:6]
+
+    async def test_forgetting_primary_closes_pool(self, pooled_proxy, transport):
+        tasks = list(pooled_proxy._connection_tasks.values())
+        pooled_proxy._connection_tasks["srv"].cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(session.closed for session in transport)
+        assert "srv" not in pooled_proxy.underlying_servers
+        assert "srv" not in pooled_proxy._session_pools
+        assert pooled_proxy._reconnect_tasks == {}
+
+    async def test_tool_error_keeps_session(self, pooled_proxy, transport, monkeypatch):
+        async def failing(tool_name, arguments):
+            raise RuntimeError("bad arguments")
+
+        monkeypatch.setattr(transport[1], "call_tool", failing)
+        result = await pooled_proxy._forward_tool_call("srv_echo", {})
+        assert "bad arguments" in result[0].text
+        assert set(pooled_proxy._session_pools["srv"]) == set(transport)
+        assert pooled_proxy._reconnect_tasks == {}
+
+    async def test_resolve_content_source_evicts_dead_session(self, pooled_proxy, transport):
+        transport[1].dead = True
+        with pytest.raises(ValueError, match="Connection closed"):
+            await pooled_proxy._resolve_content_source({"tool": "srv_echo"})
+        assert transport[1] not in pooled_proxy._session_pools["srv"]
+        await pooled_proxy._reconnect_tasks["srv#1"]
+        assert len(pooled_proxy._session_pools["srv"]) == 3
+
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])